@@ -0,0 +1,92 @@
+"""
+Annual (8760-hour) simulation of every RS0001 and RS0004 example against a synthetic weather year,
+reporting simulated units per second for increasing numbers of worker processes.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.annual_simulation [repetitions]
+"""
+import concurrent.futures
+import os
+import sys
+import time
+
+import numpy as np
+
+import schema205
+from schema205.simulate import simulate
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema")
+EXAMPLES_PATH = os.path.join(ROOT_PATH, "examples")
+HOURS = 8760
+
+
+def weather_year(seed=0):
+    """Synthetic hourly outdoor dry-bulb temperature (K) and load fraction."""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(HOURS)
+    seasonal = -np.cos(2.0 * np.pi * hours / HOURS)
+    daily = -np.cos(2.0 * np.pi * (hours % 24) / 24.0)
+    outdoor = 291.15 + 12.0 * seasonal + 5.0 * daily + rng.normal(0.0, 1.0, HOURS)
+    load_fraction = np.clip(0.5 * seasonal + 0.3 * daily + 0.3 + rng.normal(0.0, 0.05, HOURS), 0.0, 1.1)
+    load_fraction[load_fraction < 0.05] = 0.0
+    return outdoor, load_fraction
+
+
+def unit_conditions(representation, outdoor):
+    """Conditions for every grid variable: outdoor temperatures, otherwise mid-range values."""
+    conditions = {}
+    for name, node in representation["performance"].items():
+        if name.startswith("performance_map"):
+            for var, axis in node["grid_variables"].items():
+                conditions[var] = np.full(HOURS, (axis[0] + axis[-1]) / 2.0)
+    for var in [
+        "condenser_air_entering_drybulb_temperature",
+        "environment_dry_bulb_temperature",
+        "outdoor_coil_entering_dry_bulb_temperature",
+        "outdoor_coil_environment_dry_bulb_temperature",
+    ]:
+        conditions[var] = outdoor
+    return conditions
+
+
+_worker_registry = None
+
+
+def _initialize_worker():
+    global _worker_registry
+    _worker_registry = schema205.SchemaRegistry(SCHEMA_PATH)
+
+
+def simulate_unit(path):
+    representation = schema205.load_json(path)
+    outdoor, load_fraction = weather_year()
+    capacity_name = "net_evaporator_capacity" if "RS0001" in path else "gross_total_capacity"
+    lookup_variables = representation["performance"]["performance_map_cooling"]["lookup_variables"]
+    load = load_fraction * max(lookup_variables[capacity_name])
+    results = simulate(
+        _worker_registry.get_for_instance(representation),
+        representation,
+        unit_conditions(representation, outdoor),
+        load,
+    )
+    return results["power"].sum() / 1000.0  # kWh
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    paths = [
+        path
+        for path in schema205.schema.collect_files(EXAMPLES_PATH)
+        if path.endswith((".RS0001.a205.json", ".RS0004.a205.json"))
+    ] * repetitions
+    cpu_count = os.cpu_count() or 1
+    print(f"{len(paths)} annual simulations, {HOURS} hours each")
+    print(f"{'processes':>10}{'time (s)':>12}{'units/s':>10}")
+    for jobs in sorted({1, max(cpu_count // 2, 1), cpu_count}):
+        start = time.perf_counter()
+        with concurrent.futures.ProcessPoolExecutor(jobs, initializer=_initialize_worker) as executor:
+            list(executor.map(simulate_unit, paths, chunksize=4))
+        elapsed = time.perf_counter() - start
+        print(f"{jobs:>10}{elapsed:>12.2f}{len(paths)/elapsed:>10.1f}")
@@ -0,0 +1,32 @@
+"""
+File size and load time of every example representation as JSON and as CBOR (schema205.file_io).
+
+Run from the repository root:
+
+    python -m benchmarks.cbor [repetitions]
+"""
+import os
+import sys
+import tempfile
+
+import schema205
+from benchmarks.timing import time_loads
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+EXAMPLES_PATH = os.path.join(ROOT_PATH, "examples")
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    json_paths = [path for path in schema205.schema.collect_files(EXAMPLES_PATH) if path.endswith(".a205.json")]
+    with tempfile.TemporaryDirectory() as cbor_dir:
+        cbor_paths = []
+        for path in json_paths:
+            cbor_path = os.path.join(cbor_dir, os.path.basename(path)[: -len(".json")] + ".cbor")
+            schema205.dump(schema205.load_json(path), cbor_path)
+            cbor_paths.append(cbor_path)
+        print(f"{len(json_paths)} representations")
+        print(f"{'format':>8}{'size (MB)':>12}{'load (s)':>10}")
+        for name, paths in [("json", json_paths), ("cbor", cbor_paths)]:
+            size = sum(os.path.getsize(path) for path in paths)
+            print(f"{name:>8}{size / 1e6:>12.2f}{time_loads(schema205.load, paths, repetitions):>10.3f}")
@@ -0,0 +1,44 @@
+"""
+File size and load time of every example representation as JSON and as columnar containers
+(schema205.columnar), at full precision and with float32 lookup variables, and the best load time of
+the largest example (HPDM.RS0004) in each format.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.columnar [repetitions]
+"""
+import os
+import sys
+import tempfile
+
+import schema205
+from schema205.columnar import export_dir, load_columnar
+from benchmarks.timing import best_time, time_loads
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema")
+EXAMPLES_PATH = os.path.join(ROOT_PATH, "examples")
+HPDM_PATH = os.path.join(EXAMPLES_PATH, "RS0004", "HPDM.RS0004.a205.json")
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    json_paths = [path for path in schema205.schema.collect_files(EXAMPLES_PATH) if path.endswith(".a205.json")]
+    with tempfile.TemporaryDirectory() as output_dir:
+        full_paths = export_dir(EXAMPLES_PATH, SCHEMA_PATH, os.path.join(output_dir, "full"))
+        float32_paths = export_dir(EXAMPLES_PATH, SCHEMA_PATH, os.path.join(output_dir, "float32"), float32=True)
+        print(f"{len(json_paths)} representations")
+        print(f"{'format':>10}{'size (MB)':>12}{'load (s)':>10}")
+        for name, load, paths in [
+            ("json", schema205.load_json, json_paths),
+            ("columnar", load_columnar, full_paths),
+            ("float32", load_columnar, float32_paths),
+        ]:
+            size = sum(os.path.getsize(path) for path in paths)
+            print(f"{name:>10}{size / 1e6:>12.2f}{time_loads(load, paths, repetitions):>10.4f}")
+
+        hpdm_path = os.path.join(output_dir, "full", os.path.basename(HPDM_PATH)[: -len(".json")] + ".col")
+        json_time = best_time(schema205.load_json, HPDM_PATH, repetitions)
+        columnar_time = best_time(load_columnar, hpdm_path, repetitions)
+        print(f"HPDM.RS0004: json {json_time * 1e3:.2f} ms, columnar {columnar_time * 1e3:.2f} ms "
+              f"({json_time / columnar_time:.1f}x faster)")
@@ -0,0 +1,39 @@
+"""
+Memory (tracemalloc) held by every example representation loaded as plain JSON objects and as compact
+representations (A205Schema.compact), and the time taken to load them.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.compact_memory
+"""
+import os
+import time
+import tracemalloc
+
+import schema205
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema")
+EXAMPLES_PATH = os.path.join(ROOT_PATH, "examples")
+
+
+def measure(load, paths):
+    tracemalloc.start()
+    start = time.perf_counter()
+    representations = [load(path) for path in paths]
+    elapsed = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return representations, size, peak, elapsed
+
+
+if __name__ == "__main__":
+    paths = [path for path in schema205.schema.collect_files(EXAMPLES_PATH) if path.endswith(".a205.json")]
+    registry = schema205.SchemaRegistry(SCHEMA_PATH, max_size=64)
+    for path in paths:  # Compile schemas and their array typecodes outside of the measurements
+        registry.get_for_instance(schema205.load_json(path)).get_array_typecodes()
+    print(f"{len(paths)} representations")
+    print(f"{'loader':>10}{'held (MB)':>12}{'peak (MB)':>12}{'time (s)':>10}")
+    for name, load in [("plain", schema205.load_json), ("compact", registry.load_compact)]:
+        _, size, peak, elapsed = measure(load, paths)
+        print(f"{name:>10}{size / 1e6:>12.2f}{peak / 1e6:>12.2f}{elapsed:>10.2f}")
@@ -0,0 +1,67 @@
+"""
+Compare full validation against the fail-fast modes of A205Schema.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.fail_fast
+"""
+import copy
+import os
+import timeit
+
+import schema205
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema")
+EXAMPLES_PATH = os.path.join(ROOT_PATH, "examples")
+BAD_EXAMPLES_PATH = os.path.join(ROOT_PATH, "test", "bad-examples")
+
+
+def corrupt(instance):
+    """Return a copy of a large instance with every lookup value replaced by a string."""
+    instance = copy.deepcopy(instance)
+    for map_name, performance_map in instance["performance"].items():
+        if map_name.startswith("performance_map"):
+            for values in performance_map["lookup_variables"].values():
+                values[:] = ["bad"] * len(values)
+    return instance
+
+
+def collect_cases():
+    cases = []
+    for file_name in sorted(os.listdir(BAD_EXAMPLES_PATH)):
+        try:
+            instance = schema205.load_json(os.path.join(BAD_EXAMPLES_PATH, file_name))
+        except Exception:
+            continue  # Not parseable; rejected before validation
+        cases.append((file_name, instance))
+    for rs, file_name in [
+        ("RS0004", "HPDM.RS0004.a205.json"),
+        ("RS0002", "residential-unitary.RS0002.json"),
+        ("RS0004", "residential-dx.RS0004.json"),
+    ]:
+        instance = schema205.load_json(os.path.join(EXAMPLES_PATH, rs, file_name))
+        cases.append((f"corrupted {file_name}", corrupt(instance)))
+    return cases
+
+
+def time_call(function, number):
+    def run():
+        try:
+            function()
+        except Exception:
+            pass
+
+    return min(timeit.repeat(run, number=number, repeat=3)) / number
+
+
+if __name__ == "__main__":
+    registry = schema205.SchemaRegistry(SCHEMA_PATH)
+    print(f"{'case':<45}{'full (ms)':>12}{'max_errors=1':>14}{'is_valid':>12}")
+    for name, instance in collect_cases():
+        schema = registry.get_for_instance(instance)
+        number = 3
+        full = time_call(lambda: schema.validate(instance), number)
+        budget = time_call(lambda: schema.validate(instance, max_errors=1), number)
+        fast = time_call(lambda: schema.is_valid(instance), number)
+        print(f"{name:<45}{full*1e3:>12.2f}{budget*1e3:>14.2f}{fast*1e3:>12.2f}")
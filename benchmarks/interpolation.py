@@ -0,0 +1,47 @@
+"""
+Bulk evaluation of the RS0004 HPDM cooling performance map with linear and cubic interpolation, and
+the cost of cubic relative to linear interpolation.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.interpolation
+"""
+import os
+import timeit
+
+import numpy as np
+
+import schema205
+from schema205.interpolate import PerformanceMap, LINEAR, CUBIC
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema", "RS0004.schema.json")
+EXAMPLE_PATH = os.path.join(ROOT_PATH, "examples", "RS0004", "HPDM.RS0004.a205.json")
+LINEAGE = ["performance", "performance_map_cooling"]
+
+
+def random_targets(performance_map, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack(
+        [rng.uniform(axis[0], axis[-1], size) for axis in performance_map.interpolator.axes]
+    )
+
+
+if __name__ == "__main__":
+    schema = schema205.A205Schema(SCHEMA_PATH)
+    performance_map = PerformanceMap(schema, schema205.load_json(EXAMPLE_PATH), LINEAGE)
+    ndim = len(performance_map.grid_variable_names)
+    cases = [
+        ("linear", LINEAR),
+        ("cubic (temperatures)", [CUBIC, LINEAR, CUBIC, LINEAR, LINEAR, LINEAR]),
+        ("cubic (all axes)", CUBIC),
+    ]
+    print(f"{'method':<25}{'targets':>10}{'time (ms)':>12}{'targets/s':>14}{'vs linear':>11}")
+    for size in [1000, 100000]:
+        targets = random_targets(performance_map, size)
+        linear_time = None
+        for name, methods in cases:
+            performance_map(targets[:10], methods)  # Slope tables are computed on first use
+            elapsed = min(timeit.repeat(lambda: performance_map(targets, methods), number=1, repeat=3))
+            linear_time = linear_time or elapsed
+            print(f"{name:<25}{size:>10}{elapsed*1e3:>12.1f}{size/elapsed:>14.0f}{elapsed/linear_time:>10.1f}x")
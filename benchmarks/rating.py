@@ -0,0 +1,32 @@
+"""
+IPLV ratings of every RS0001 example, without and with the cache of parsed maps, reporting rated
+chillers per second for increasing numbers of worker processes.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.rating
+"""
+import glob
+import os
+import tempfile
+import time
+
+from schema205.rating import rate_files
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema")
+EXAMPLES_PATH = os.path.join(ROOT_PATH, "examples", "RS0001")
+
+
+if __name__ == "__main__":
+    paths = sorted(glob.glob(os.path.join(EXAMPLES_PATH, "*.RS0001.a205.json")))
+    cpu_count = os.cpu_count() or 1
+    print(f"{len(paths)} chillers")
+    print(f"{'processes':>10}{'cache':>8}{'time (s)':>12}{'chillers/s':>12}")
+    for jobs in sorted({1, max(cpu_count // 2, 1), cpu_count}):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for cache in ["cold", "warm"]:
+                start = time.perf_counter()
+                rate_files(paths, SCHEMA_PATH, jobs=jobs, cache_dir=cache_dir)
+                elapsed = time.perf_counter() - start
+                print(f"{jobs:>10}{cache:>8}{elapsed:>12.3f}{len(paths)/elapsed:>12.1f}")
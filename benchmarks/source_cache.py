@@ -0,0 +1,72 @@
+"""
+Time of a full generation pipeline (meta-schema validation, JSON schema, Markdown, C++ and template
+rendering) in a fresh process, with an empty (cold) and a populated (warm) cache of parsed
+schema-source YAML (schema205.file_io.SOURCE_CACHE_DIR, see load_source).
+
+Run from the repository root:
+
+    python -m benchmarks.source_cache [repetitions]
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.timing import time_call
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOURCE_PATH = os.path.join(ROOT_PATH, "schema-source")
+TEMPLATE_PATH = os.path.join(ROOT_PATH, "rendering_examples", "template_rendering")
+
+
+def run_pipeline(output_dir):
+    import schema205.cpp_translate
+    import schema205.json_translate
+    import schema205.markdown
+    import schema205.render_template
+    import schema205.validate
+
+    for name in ["schema", "docs", "include", "cpp", "rendered"]:
+        os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        schema205.validate.validate_dir(SOURCE_PATH)
+        schema205.json_translate.translate_dir(SOURCE_PATH, os.path.join(output_dir, "schema"))
+        schema205.markdown.write_dir(SOURCE_PATH, os.path.join(output_dir, "docs"))
+        schema205.cpp_translate.translate_all_to_source(
+            SOURCE_PATH, os.path.join(output_dir, "include"), os.path.join(output_dir, "cpp"), "tk205"
+        )
+        schema205.render_template.main(
+            "main.md.j2",
+            os.path.join(output_dir, "rendered", "main.md"),
+            TEMPLATE_PATH,
+            log_file=os.path.join(output_dir, "rendered", "error-log.txt"),
+        )
+
+
+def time_process(output_dir, cache_dir):
+    environment = dict(os.environ, SCHEMA205_SOURCE_CACHE=cache_dir, PYTHONPATH=ROOT_PATH)
+    return time_call(
+        subprocess.run,
+        [sys.executable, "-m", "benchmarks.source_cache", "--pipeline", output_dir],
+        cwd=ROOT_PATH,
+        env=environment,
+        check=True,
+    )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--pipeline"]:
+        run_pipeline(sys.argv[2])
+        sys.exit()
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'cache':>8}{'pipeline (s)':>14}")
+    cold, warm = [], []
+    for _ in range(repetitions):
+        with tempfile.TemporaryDirectory() as output_dir:
+            cache_dir = os.path.join(output_dir, "cache")
+            cold.append(time_process(output_dir, cache_dir))
+            warm.append(time_process(output_dir, cache_dir))
+    print(f"{'cold':>8}{min(cold):>14.2f}")
+    print(f"{'warm':>8}{min(warm):>14.2f}")
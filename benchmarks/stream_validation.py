@@ -0,0 +1,100 @@
+"""
+Peak memory (tracemalloc) and time of validating a representation with A205Schema.validate (after
+loading the whole file) and with A205Schema.validate_stream, which holds one data group at a time.
+
+The representation is the HPDM example (RS0004) with heating and defrost correction maps as large as
+its cooling map, so that no single data group holds most of the file.
+
+Run from the repository root after building the schema (``doit schema``):
+
+    python -m benchmarks.stream_validation
+"""
+import contextlib
+import io
+import itertools
+import os
+import tempfile
+import time
+import tracemalloc
+
+import schema205
+
+ROOT_PATH = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA_PATH = os.path.join(ROOT_PATH, "build", "schema")
+HPDM_PATH = os.path.join(ROOT_PATH, "examples", "RS0004", "HPDM.RS0004.a205.json")
+
+
+def make_map(grid_variables, lookup_variables):
+    """Return a performance map of the grid variables, with lookup values following the grid points."""
+    points = list(itertools.product(*grid_variables.values()))
+    return {
+        "grid_variables": grid_variables,
+        "lookup_variables": {
+            name: [value(*point) for point in points] for name, value in lookup_variables.items()
+        },
+    }
+
+
+def make_heat_pump():
+    representation = schema205.load_json(HPDM_PATH)
+    performance = representation["performance"]
+    performance["performance_capabilities"] = ["COOLING", "HEATING"]
+    performance["heating_cycling_degradation_coefficient"] = 0.1
+    outdoor_temperatures = [253.15 + 2.0 * i for i in range(20)]
+    stages = [1, 2]
+    performance["performance_map_heating"] = make_map(
+        {
+            "outdoor_coil_entering_dry_bulb_temperature": outdoor_temperatures,
+            "indoor_coil_entering_dry_bulb_temperature": [283.15 + i for i in range(14)],
+            "indoor_coil_air_mass_flow_rate": [0.2 + 0.05 * i for i in range(16)],
+            "compressor_sequence_number": stages,
+        },
+        {
+            "gross_frost_free_capacity": lambda t_o, t_i, m, n: 1000.0 * n + 20.0 * (t_o - t_i) + 500.0 * m,
+            "gross_frost_free_power": lambda t_o, t_i, m, n: 400.0 * n + 5.0 * (t_i - t_o) + 50.0 * m,
+            "operation_state": lambda *point: "NORMAL",
+        },
+    )
+    performance["performance_map_defrost_correction"] = make_map(
+        {
+            "outdoor_coil_entering_dry_bulb_temperature": outdoor_temperatures,
+            "outdoor_coil_entering_relative_humidity": [0.05 * i for i in range(1, 21)],
+            "compressor_sequence_number": stages,
+        },
+        {
+            "capacity_correction_factor": lambda t_o, rh, n: 1.0 - 0.2 * rh,
+            "power_correction_factor": lambda t_o, rh, n: 1.0 + 0.1 * rh,
+            "defrost_time_fraction": lambda t_o, rh, n: 0.1 * rh,
+        },
+    )
+    return representation
+
+
+def measure(validate):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        validate()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+if __name__ == "__main__":
+    registry = schema205.SchemaRegistry(SCHEMA_PATH)
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        path = os.path.join(temporary_dir, "heat-pump.RS0004.a205.json")
+        representation = make_heat_pump()
+        schema = registry.get_for_instance(representation)
+        schema205.dump(representation, path)
+        del representation
+        print(f"{os.path.basename(path)}: {os.path.getsize(path) / 1e6:.2f} MB")
+        print(f"{'validation':>12}{'peak (MB)':>12}{'time (s)':>10}")
+        for name, validate in [
+            ("full", lambda: schema.validate(schema205.load_json(path))),
+            ("stream", lambda: schema.validate_stream(path)),
+        ]:
+            measure(validate)  # Warm up (e.g., compile validators)
+            peak, elapsed = measure(validate)
+            print(f"{name:>12}{peak / 1e6:>12.2f}{elapsed:>10.2f}")
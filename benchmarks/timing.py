@@ -0,0 +1,25 @@
+"""
+Timing helpers shared by the benchmarks.
+"""
+import time
+
+
+def time_call(function, *args, **kwargs):
+    """Return the time (s) taken by function(*args, **kwargs)."""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def time_loads(load, paths, repetitions):
+    """Return the mean time (s) taken by load to load every path in paths."""
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for path in paths:
+            load(path)
+    return (time.perf_counter() - start) / repetitions
+
+
+def best_time(load, path, repetitions):
+    """Return the shortest of repetitions times (s) taken by load to load path."""
+    return min(time_call(load, path) for _ in range(repetitions))
@@ -3,6 +3,9 @@ import schema205.markdown
 import schema205.json_translate
 import schema205.cpp_translate
 import schema205.render_template
+import schema205.bundle
+import schema205.build
+import schema205.file_io
 import os
 from doit.tools import create_folder
 from schema205.util import snake_style
@@ -13,9 +16,13 @@ DOCS_PATH = os.path.join(BUILD_PATH,"docs")
 SCHEMA_PATH = os.path.join(BUILD_PATH,"schema")
 HEADER_PATH = os.path.join(BUILD_PATH, "include")
 CPP_PATH = os.path.join(BUILD_PATH, "cpp")
+BUNDLE_PATH = os.path.join(BUILD_PATH,"bundle")
 RENDERED_TEMPLATE_PATH = os.path.realpath(
         os.path.join(BUILD_PATH,"rendered_template"))
 
+# 'build_all' regenerates the outputs of the other tasks, so it only runs when requested
+DOIT_CONFIG = {'default_tasks': ['validate', 'doc', 'render_template', 'schema', 'bundle', 'cpp', 'test']}
+
 def collect_source_files():
   file_list = []
   for file_name in sorted(os.listdir('schema-source')):
@@ -26,47 +33,59 @@ def collect_source_files():
 def collect_cpp_generators():
   return [os.path.join('schema205', generator_py) for generator_py in ['cpp_entries.py', 'header_entries.py', 'cpp_translate.py']]
 
-def collect_target_files(target_dir, extension):
-  file_list = []
-  for file_name in sorted(os.listdir('schema-source')):
-    if '.schema.yaml' in file_name:
-      file_name_root = os.path.splitext(os.path.splitext(file_name)[0])[0]
-      file_list.append(os.path.join(target_dir,f'{file_name_root}.schema.{extension}'))
-  return file_list
+# Keep parsed schema sources between doit runs, unless another directory (or none) is configured
+if 'SCHEMA205_SOURCE_CACHE' not in os.environ:
+  schema205.file_io.SOURCE_CACHE_DIR = os.path.join(BUILD_PATH, 'source_cache')
 
-def collect_lib_target_files(target_dir, extension):
-  file_list = []
-  for file_name in sorted(os.listdir('schema-source')):
-    if '.schema.yaml' in file_name:
-      file_name_root = snake_style(os.path.splitext(os.path.splitext(file_name)[0])[0])
-      file_list.append(os.path.join(target_dir,f'{file_name_root}.{extension}'))
-      file_list.append(os.path.join(target_dir,f'{file_name_root}_factory.{extension}'))
+# Names of the schemas each schema depends on, directly or through nested schemas
+SOURCE_DEPENDENCIES = schema205.build.get_source_dependencies(SOURCE_PATH)
+
+def collect_dependency_files(name, directory, extension):
+  '''Return the files of schema 'name' and of every schema it depends on'''
+  return [os.path.join(directory, f'{root}.schema.{extension}') for root in [name] + SOURCE_DEPENDENCIES[name]]
+
+def collect_dependency_tasks(name, task):
+  return [f'{task}:{root}' for root in [name] + SOURCE_DEPENDENCIES[name]]
+
+def collect_lib_target_files(name):
+  file_name_root = snake_style(name)
+  file_list = [os.path.join(HEADER_PATH, f'{file_name_root}.h'), os.path.join(CPP_PATH, f'{file_name_root}.cpp')]
+  if 'RS' in name:
+    file_list.append(os.path.join(HEADER_PATH, f'{file_name_root}_factory.h'))
+    file_list.append(os.path.join(CPP_PATH, f'{file_name_root}_factory.cpp'))
   return file_list
 
 def task_validate():
   '''Validates source-schema against meta-schema'''
-  return {
-    'file_dep': [os.path.join("meta-schema","meta.schema.json")] + collect_source_files(),
-    'actions': [(schema205.validate.validate_dir,[SOURCE_PATH])]
-  }
+  for name in SOURCE_DEPENDENCIES:
+    source_file = os.path.join(SOURCE_PATH, f'{name}.schema.yaml')
+    yield {
+      'name': name,
+      'file_dep': [os.path.join("meta-schema","meta.schema.json"), source_file],
+      'actions': [(schema205.validate.validate_file,[source_file])]
+    }
 
 def task_doc():
   '''Generates Markdown tables from source-schema'''
-  return {
-    'file_dep': collect_source_files() + [
-        os.path.join('schema205','markdown.py'),
-        os.path.join('schema205','md','__init__.py'),
-        os.path.join('schema205','md','schema_table.py'),
-        os.path.join('schema205','md','grid_table.py'),
+  for name in SOURCE_DEPENDENCIES:
+    source_file = os.path.join(SOURCE_PATH, f'{name}.schema.yaml')
+    target = os.path.join(DOCS_PATH, f'{name}.schema.md')
+    yield {
+      'name': name,
+      'file_dep': [source_file,
+          os.path.join('schema205','markdown.py'),
+          os.path.join('schema205','md','__init__.py'),
+          os.path.join('schema205','md','schema_table.py'),
+          os.path.join('schema205','md','grid_table.py'),
+          ],
+      'targets': [target],
+      'task_dep': [f'validate:{name}'],
+      'actions': [
+        (create_folder, [DOCS_PATH]),
+        (schema205.markdown.write_file,[source_file, target])
         ],
-    'targets': collect_target_files(DOCS_PATH,'md'),
-    'task_dep': ['validate'],
-    'actions': [
-      (create_folder, [DOCS_PATH]),
-      (schema205.markdown.write_dir,[SOURCE_PATH, DOCS_PATH])
-      ],
-    'clean': True
-  }
+      'clean': True
+    }
 
 def task_render_template():
   '''
@@ -97,29 +116,66 @@ def task_render_template():
 
 def task_schema():
   '''Generates JSON schema from source-schema'''
-  return {
-    'file_dep': [os.path.join('schema205', 'json_translate.py')] + collect_source_files(),
-    'targets': collect_target_files(SCHEMA_PATH,'json'),
-    'task_dep': ['validate'],
-    'actions': [
-      (create_folder, [SCHEMA_PATH]),
-      (schema205.json_translate.translate_dir,[SOURCE_PATH, SCHEMA_PATH])
-      ],
-    'clean': True
-  }
+  for name in SOURCE_DEPENDENCIES:
+    target = os.path.join(SCHEMA_PATH, f'{name}.schema.json')
+    yield {
+      'name': name,
+      'file_dep': [os.path.join('schema205', 'json_translate.py')] + collect_dependency_files(name, SOURCE_PATH, 'yaml'),
+      'targets': [target],
+      'task_dep': collect_dependency_tasks(name, 'validate'),
+      'actions': [
+        (create_folder, [SCHEMA_PATH]),
+        (schema205.json_translate.translate_file,[os.path.join(SOURCE_PATH, f'{name}.schema.yaml'), target])
+        ],
+      'clean': True
+    }
+
+def task_bundle():
+  '''Generates self-contained (bundled) JSON schema from JSON schema'''
+  for name in SOURCE_DEPENDENCIES:
+    target = os.path.join(BUNDLE_PATH, f'{name}.schema.json')
+    yield {
+      'name': name,
+      'file_dep': [os.path.join('schema205', 'bundle.py')] + collect_dependency_files(name, SCHEMA_PATH, 'json'),
+      'targets': [target],
+      'task_dep': collect_dependency_tasks(name, 'schema'),
+      'actions': [
+        (create_folder, [BUNDLE_PATH]),
+        (schema205.bundle.bundle_file,[os.path.join(SCHEMA_PATH, f'{name}.schema.json'), target])
+        ],
+      'clean': True
+    }
 
 def task_cpp():
   '''Generates CPP source files from common-schema'''
+  for name in SOURCE_DEPENDENCIES:
+    yield {
+      'name': name,
+      'file_dep': collect_dependency_files(name, SOURCE_PATH, 'yaml') + collect_cpp_generators(),
+      'targets': collect_lib_target_files(name),
+      'task_dep': collect_dependency_tasks(name, 'validate'),
+      'actions': [
+        (create_folder, [HEADER_PATH]),
+        (create_folder, [CPP_PATH]),
+        (schema205.cpp_translate.translate_files_to_source,
+            [[os.path.join(SOURCE_PATH, f'{name}.schema.yaml')], HEADER_PATH, CPP_PATH, "tk205"])
+        ],
+      'clean': True
+    }
+
+def task_build_all():
+  '''Generates all outputs in a single pass, parsing and validating each source once'''
   return {
-    'file_dep': collect_source_files() + collect_cpp_generators(),
-    'targets': collect_lib_target_files(HEADER_PATH,'h') + collect_lib_target_files(CPP_PATH,'cpp'),
-    'task_dep': ['validate'],
-    'actions': [
-      (create_folder, [HEADER_PATH]),
-      (create_folder, [CPP_PATH]),
-      (schema205.cpp_translate.translate_all_to_source,[SOURCE_PATH, HEADER_PATH, CPP_PATH, "tk205"])
-      ],
-    'clean': True
+    'file_dep': [os.path.join("meta-schema","meta.schema.json")] + collect_source_files() + [
+        os.path.join('schema205', 'build.py'),
+        os.path.join('schema205', 'json_translate.py'),
+        os.path.join('schema205', 'bundle.py'),
+        os.path.join('schema205', 'markdown.py'),
+        os.path.join('schema205', 'render_template.py'),
+        ] + collect_cpp_generators(),
+    'actions': [(schema205.build.build_all, [SOURCE_PATH, BUILD_PATH])],
+    'uptodate': [False],
+    'verbosity': 2
   }
 
 def task_test():
@@ -2,5 +2,5 @@
 Schema 205 Package Initialization
 """
 from .file_io import *
-from .schema import A205Schema
+from .schema import A205Schema, SchemaRegistry
 from .util import *
@@ -0,0 +1,162 @@
+"""
+Single-pass build of every artifact generated from the schema sources.
+
+Each *.schema.yaml file is parsed once (see file_io.load_source) and meta-validated once; the same
+parsed trees then feed the JSON schema, bundle, Markdown, C++ and template stages.
+"""
+import os
+import re
+import time
+from collections import OrderedDict
+
+from .file_io import load_source, dump
+from .validate import A205MetaSchema
+from .json_translate import JSON_translator
+from .bundle import bundle_dir
+from .markdown import write_tables
+from .cpp_translate import translate_files_to_source
+from .render_template import main as render_template
+
+META_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "meta-schema", "meta.schema.json")
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "..", "rendering_examples", "template_rendering")
+
+# Output directory of each stage, relative to the build directory (as in dodo.py)
+OUTPUT_DIRS = {
+    "schema": "schema",
+    "bundle": "bundle",
+    "doc": "docs",
+    "cpp_headers": "include",
+    "cpp_sources": "cpp",
+    "render_template": "rendered_template",
+}
+
+
+def get_file_name_root(file_name):
+    return os.path.splitext(os.path.splitext(os.path.basename(file_name))[0])[0]
+
+
+def get_source_references(instance):
+    """
+    Return the names of the schemas a schema source refers to: its Schema References, and the data
+    groups named in the Data Types of its data elements (e.g., '{RS0003}' in RS0002), which may be
+    nested schemas.
+    """
+    references = list(instance.get("Schema", {}).get("References", []))
+    for item in instance.values():
+        data_elements = item.get("Data Elements") if isinstance(item, dict) else None
+        if isinstance(data_elements, dict):
+            for element in data_elements.values():
+                if isinstance(element, dict) and isinstance(element.get("Data Type"), str):
+                    references += re.findall(r"\{(\w+)\}", element["Data Type"])
+    return references
+
+
+def get_source_dependencies(source_dir):
+    """
+    Return a dictionary of the schema names (file name roots) in source_dir, each with the sorted names
+    of every other schema it depends on, directly or through other schemas (e.g., RS0002 depends on
+    RS0003, which depends on RS0005 and RS0007).
+    """
+    names = [get_file_name_root(file_name) for file_name in sorted(os.listdir(source_dir)) if ".schema.yaml" in file_name]
+    direct = {}
+    for name in names:
+        references = get_source_references(load_source(os.path.join(source_dir, name + ".schema.yaml")))
+        direct[name] = set(reference for reference in references if reference in names)
+    dependencies = {}
+    for name in names:
+        found = set()
+        pending = list(direct[name])
+        while pending:
+            reference = pending.pop()
+            if reference not in found:
+                found.add(reference)
+                pending += direct[reference]
+        found.discard(name)
+        dependencies[name] = sorted(found)
+    return dependencies
+
+
+def build_all(source_dir, out_dir, container="tk205", template_dir=TEMPLATE_DIR, main_template="main.md.j2"):
+    """
+    Generate JSON schema, bundled schema, Markdown docs, C++ headers and sources and the rendered
+    template from the sources in source_dir, in the subdirectories of out_dir given by OUTPUT_DIRS.
+
+    Returns an ordered dictionary of the time (s) taken by each stage.
+    """
+    timings = OrderedDict()
+    clock = [time.perf_counter()]
+
+    def finish(stage):
+        now = time.perf_counter()
+        timings[stage] = now - clock[0]
+        clock[0] = now
+
+    for output_dir in OUTPUT_DIRS.values():
+        os.makedirs(os.path.join(out_dir, output_dir), exist_ok=True)
+
+    source_paths = [
+        os.path.join(source_dir, file_name)
+        for file_name in sorted(os.listdir(source_dir))
+        if ".schema.yaml" in file_name
+    ]
+    sources = OrderedDict((path, load_source(path)) for path in source_paths)
+    finish("load")
+
+    meta_schema = A205MetaSchema(META_SCHEMA_PATH)
+    for path, instance in sources.items():
+        meta_schema.validate_instance(instance, os.path.basename(path))
+    finish("validate")
+
+    translator = JSON_translator()
+    schema_dir = os.path.join(out_dir, OUTPUT_DIRS["schema"])
+    for path in sources:
+        dump(
+            translator.load_common_schema(path),
+            os.path.join(schema_dir, get_file_name_root(path) + ".schema.json"),
+        )
+    finish("schema")
+
+    bundle_dir(schema_dir, os.path.join(out_dir, OUTPUT_DIRS["bundle"]))
+    finish("bundle")
+
+    for path, instance in sources.items():
+        output_path = os.path.join(out_dir, OUTPUT_DIRS["doc"], get_file_name_root(path) + ".schema.md")
+        write_tables(instance, output_path, append=False)
+        print(f"Markdown generation successful for {os.path.basename(path)}")
+    finish("doc")
+
+    translate_files_to_source(
+        source_paths,
+        os.path.join(out_dir, OUTPUT_DIRS["cpp_headers"]),
+        os.path.join(out_dir, OUTPUT_DIRS["cpp_sources"]),
+        container,
+    )
+    finish("cpp")
+
+    rendered_dir = os.path.join(out_dir, OUTPUT_DIRS["render_template"])
+    render_template(
+        main_template,
+        os.path.join(rendered_dir, "main.md"),
+        os.path.realpath(template_dir),
+        schema_dir=source_dir,
+        log_file=os.path.join(rendered_dir, "error-log.txt"),
+    )
+    finish("render_template")
+
+    print_timings(timings)
+    return timings
+
+
+def print_timings(timings):
+    width = max(len(stage) for stage in timings)
+    print(f"{'stage':<{width}}  time (s)")
+    for stage, seconds in timings.items():
+        print(f"{stage:<{width}}  {seconds:8.3f}")
+    print(f"{'total':<{width}}  {sum(timings.values()):8.3f}")
+
+
+if __name__ == "__main__":
+    build_all(
+        os.path.join(os.path.dirname(__file__), "..", "schema-source"),
+        os.path.join(os.path.dirname(__file__), "..", "build"),
+    )
@@ -0,0 +1,83 @@
+"""
+Bundling of generated schemas into self-contained schema documents.
+
+References between schema files (e.g., 'ASHRAE205.schema.json#/definitions/Metadata', or
+'RS0003.schema.json#/definitions/RS0003' for nested representations) are relocated into the bundle:
+each referenced document is copied to '#/definitions/<file name>' and references into it become
+'#/definitions/<file name>/<pointer>'. References into the bundled schema itself become '#/<pointer>'.
+"""
+import os
+from .file_io import load_json, dump
+
+
+EXCLUDED_KEYWORDS = ["$schema", "$id"]
+
+
+def split_ref(ref, file_name):
+    """
+    Return the (file name, JSON pointer) that a reference made from within the schema file_name points
+    to. Both references between schema files and references relocated by bundle_schema are understood.
+    """
+    ref_file, _, pointer = ref.partition("#")
+    if ref_file:
+        return ref_file, pointer
+    prefix = "/definitions/"
+    if pointer.startswith(prefix):
+        head, separator, remainder = pointer[len(prefix) :].partition("/")
+        if head.endswith(".schema.json") and separator:
+            return head, f"/{remainder}"
+    return file_name, pointer
+
+
+def localize_ref(ref, file_name, document_name=None):
+    """
+    Return the equivalent of a reference in the bundle of the schema file_name. The reference is made
+    from within the schema document_name (by default, file_name itself).
+    """
+    ref_file, pointer = split_ref(ref, document_name or file_name)
+    if ref_file == file_name:
+        return f"#{pointer}"
+    return f"#/definitions/{ref_file}{pointer}"
+
+
+def bundle_schema(schema_path):
+    """
+    Return the schema at schema_path with every referenced schema document relocated into it.
+
+    Referenced documents are read from the directory of schema_path. The schema files are not modified.
+    """
+    schema_dir = os.path.dirname(schema_path)
+    file_name = os.path.basename(schema_path)
+    pending = []
+
+    def relocate(node, document_name):
+        if isinstance(node, dict):
+            relocated = {key: relocate(value, document_name) for key, value in node.items()}
+            if isinstance(node.get("$ref"), str):
+                ref_file = node["$ref"].partition("#")[0]
+                if ref_file and ref_file != file_name and ref_file not in pending:
+                    pending.append(ref_file)
+                relocated["$ref"] = localize_ref(node["$ref"], file_name, document_name)
+            return relocated
+        elif isinstance(node, list):
+            return [relocate(item, document_name) for item in node]
+        else:
+            return node
+
+    bundle = relocate(load_json(schema_path), file_name)
+    for document_name in pending:  # pending grows as documents are relocated
+        document = relocate(load_json(os.path.join(schema_dir, document_name)), document_name)
+        for keyword in EXCLUDED_KEYWORDS:
+            document.pop(keyword, None)
+        bundle.setdefault("definitions", {})[document_name] = document
+    return bundle
+
+
+def bundle_file(schema_path, output_path):
+    dump(bundle_schema(schema_path), output_path)
+
+
+def bundle_dir(schema_dir_path, output_dir_path):
+    for file_name in sorted(os.listdir(schema_dir_path)):
+        if file_name.endswith(".schema.json"):
+            bundle_file(os.path.join(schema_dir_path, file_name), os.path.join(output_dir_path, file_name))
@@ -0,0 +1,173 @@
+"""
+Command line interface (the 'schema205' script).
+
+    schema205 convert "examples/**/*.a205.json" --output "converted/*.cbor" --jobs 4 --validate
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from .columnar import dump_columnar, load_columnar
+from .file_io import dump, get_extension, load
+from .schema import create_worker_registry
+from .util import run_in_pool
+
+FORMATS = {"json": ".json", "yaml": ".yaml", "cbor": ".cbor", "columnar": ".col"}
+DEFAULT_SCHEMA_DIR = os.path.join("build", "schema")
+
+
+def to_plain(node):
+    """Return content loaded from any format (e.g., with NumPy arrays) as plain JSON-like content."""
+    if isinstance(node, dict):
+        return {key: to_plain(value) for key, value in node.items()}
+    if isinstance(node, np.ndarray):
+        return node.tolist()
+    if isinstance(node, list):
+        return [to_plain(item) for item in node]
+    return node
+
+
+def collect_inputs(patterns):
+    """Return the sorted, unique files matching any of the (recursive) glob patterns."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def get_output_path(input_path, output, output_format):
+    """
+    Return the output path of an input file. In the output pattern, '*' stands for the input file name
+    without its extension (e.g., 'converted/*.cbor'). An output without '*' is a directory.
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    if "*" in output:
+        return output.replace("*", stem, 1)
+    return os.path.join(output, stem + FORMATS[output_format])
+
+
+def get_output_format(output, output_format=None):
+    if output_format is not None:
+        return output_format
+    ext = get_extension(output).lower()
+    for name, format_ext in FORMATS.items():
+        if ext == format_ext or (name == "yaml" and ext == ".yml"):
+            return name
+    raise Exception(f"Cannot infer the output format of \"{output}\"; use --format.")
+
+
+def convert_file(input_path, output_path, output_format, validate=False, registry=None):
+    """
+    Convert a representation file to output_format, using registry (a SchemaRegistry) to validate it
+    (if validate is True) and to write columnar containers.
+
+    Returns (number of bytes read, error message or None). Invalid files are not written.
+    """
+    try:
+        if get_extension(input_path).lower() == ".col":
+            content = load_columnar(input_path)
+        else:
+            content = load(input_path)
+        schema = None
+        if validate or output_format == "columnar":
+            schema = registry.get_for_instance(content)
+        if validate:
+            with contextlib.redirect_stdout(io.StringIO()):
+                schema.validate(content)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        if output_format == "columnar":
+            dump_columnar(content, schema, output_path)
+        else:
+            dump(to_plain(content), output_path)
+    except Exception as e:  # Change to tk205 Exception
+        return os.path.getsize(input_path), f"{input_path}: {e}"
+    return os.path.getsize(input_path), None
+
+
+def _convert_file(registry, arguments):
+    return convert_file(*arguments, registry=registry)
+
+
+def convert_files(input_paths, output, output_format=None, jobs=1, validate=False, schema_dir=DEFAULT_SCHEMA_DIR):
+    """
+    Convert files to output_format (inferred from the output pattern if None).
+
+    :param jobs:    Number of worker processes. If None, use the number of available CPUs.
+
+    Returns a list of (number of bytes read, error message or None) in the order of input_paths.
+    """
+    output_format = get_output_format(output, output_format)
+    tasks = [
+        (path, get_output_path(path, output, output_format), output_format, validate) for path in input_paths
+    ]
+    if len(set(task[1] for task in tasks)) != len(tasks):
+        raise Exception("Several input files would be converted to the same output file.")
+    if validate or output_format == "columnar":
+        if not os.path.isdir(schema_dir):
+            raise Exception(f"Schema directory \"{schema_dir}\" not found (build it with 'doit schema').")
+        return run_in_pool(_convert_file, tasks, jobs, create_worker_registry, (schema_dir,))
+    return run_in_pool(_convert_file, tasks, jobs)
+
+
+def convert(arguments):
+    input_paths = collect_inputs(arguments.inputs)
+    if len(input_paths) == 0:
+        print("No input files found.", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    results = convert_files(
+        input_paths, arguments.output, arguments.format, arguments.jobs, arguments.validate, arguments.schema_dir
+    )
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    errors = [error for _, error in results if error is not None]
+    converted = len(results) - len(errors)
+    megabytes = sum(size for size, _ in results) / 1e6
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(
+        f"Converted {converted} of {len(results)} files ({megabytes:.2f} MB) in {elapsed:.2f} s: "
+        f"{len(results) / elapsed:.1f} files/s, {megabytes / elapsed:.2f} MB/s"
+    )
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="schema205")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert", help="Convert representation files between JSON, YAML, CBOR and columnar containers"
+    )
+    convert_parser.add_argument("inputs", nargs="+", help="Input files or glob patterns ('**' matches directories)")
+    convert_parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="Output directory, or output pattern where '*' is the input file name without its extension",
+    )
+    convert_parser.add_argument(
+        "-f", "--format", choices=list(FORMATS), help="Output format (default: from the output pattern)"
+    )
+    convert_parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of worker processes (0: one per CPU)"
+    )
+    convert_parser.add_argument("--validate", action="store_true", help="Validate each file; invalid files are not written")
+    convert_parser.add_argument(
+        "--schema-dir", default=DEFAULT_SCHEMA_DIR, help=f"Directory of generated schemas (default: {DEFAULT_SCHEMA_DIR})"
+    )
+    convert_parser.set_defaults(handler=convert)
+
+    arguments = parser.parse_args(argv)
+    if getattr(arguments, "jobs", None) == 0:
+        arguments.jobs = None
+    return arguments.handler(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
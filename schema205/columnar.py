@@ -0,0 +1,129 @@
+"""
+Columnar container of a representation: its non-array content as JSON, followed by each numeric
+array (e.g., grid axes and lookup variables) as raw little-endian values aligned to ALIGNMENT bytes.
+
+Layout:
+    MAGIC, the length of the JSON header (uint64), the JSON header, then the arrays.
+
+The JSON header holds the representation (with numeric arrays replaced by null) and, for each array,
+its path in the representation, dtype, offset and length. Containers are loaded by memory-mapping the
+file, so processes loading the same container share the physical pages of its arrays.
+"""
+import array
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+from .file_io import load_json
+from .schema import SchemaRegistry, collect_files, compact_array
+
+MAGIC = b"A205COL\x00"
+VERSION = 1
+ALIGNMENT = 64
+DTYPES = {"d": "<f8", "q": "<i8"}
+QUANTIZED_DTYPE = "<f4"
+
+
+def padding(offset):
+    return -offset % ALIGNMENT
+
+
+def dump_columnar(representation, schema, output_path, float32=False):
+    """
+    Write a representation (plain or compact, see A205Schema.compact) to a columnar container.
+
+    :param schema:  A205Schema of the representation, which identifies its numeric arrays
+    :param float32: If True, lookup variables are stored as float32. Grid axes and other arrays are
+                    always stored at full precision.
+    """
+    typecodes = schema.get_array_typecodes()
+    arrays = []
+    entries = []
+
+    def separate(node, lineage, path):
+        if isinstance(node, Mapping):
+            return {key: separate(value, lineage + (key,), path + [key]) for key, value in node.items()}
+        if isinstance(node, (list, tuple, array.array, np.ndarray)):
+            typecode = typecodes.get(lineage)
+            if typecode is not None:
+                values = node if isinstance(node, (array.array, np.ndarray)) else compact_array(node, typecode)
+                if values is not None:  # Arrays with invalid values are kept in the header
+                    dtype = DTYPES[typecode]
+                    if float32 and typecode == "d" and "lookup_variables" in lineage:
+                        dtype = QUANTIZED_DTYPE
+                    arrays.append(np.asarray(values).astype(dtype))
+                    entries.append({"path": path, "dtype": dtype, "length": len(values)})
+                    return None
+            return [separate(item, lineage, path + [i]) for i, item in enumerate(node)]
+        return node
+
+    content = separate(representation, (), [])
+    # Offsets are relative to the start of the array section, which follows the (padded) header
+    offset = 0
+    for entry, values in zip(entries, arrays):
+        entry["offset"] = offset
+        offset += values.nbytes + padding(values.nbytes)
+    header = json.dumps(
+        {"version": VERSION, "representation": content, "arrays": entries}, separators=(",", ":")
+    ).encode("utf-8")
+    prefix_size = len(MAGIC) + 8 + len(header)
+
+    with open(output_path, "wb") as output_file:
+        output_file.write(MAGIC)
+        output_file.write(struct.pack("<Q", len(header)))
+        output_file.write(header)
+        output_file.write(bytes(padding(prefix_size)))
+        for values in arrays:
+            output_file.write(values.tobytes())
+            output_file.write(bytes(padding(values.nbytes)))
+
+
+def load_columnar(input_path):
+    """
+    Return the representation in a columnar container. Its numeric arrays are read-only NumPy arrays
+    backed by a shared, read-only memory map of the file; they are not read until they are used.
+    """
+    with open(input_path, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size < len(MAGIC) + 8:
+            raise Exception(f"'{input_path}' is not a columnar container.")
+        buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[: len(MAGIC)] != MAGIC:
+        raise Exception(f"'{input_path}' is not a columnar container.")
+    (header_size,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(buffer[header_start : header_start + header_size])
+    if header["version"] != VERSION:
+        raise Exception(f"Unsupported columnar container version {header['version']} in '{input_path}'.")
+    arrays_start = header_start + header_size
+    arrays_start += padding(arrays_start)
+
+    representation = header["representation"]
+    for entry in header["arrays"]:
+        values = np.frombuffer(
+            buffer, dtype=entry["dtype"], count=entry["length"], offset=arrays_start + entry["offset"]
+        )
+        node = representation
+        for key in entry["path"][:-1]:
+            node = node[key]
+        node[entry["path"][-1]] = values
+    return representation
+
+
+def export_dir(example_dir, schema_dir, output_dir, float32=False):
+    """
+    Write a columnar container (*.a205.col) of each *.a205.json representation in example_dir
+    (recursively) to output_dir. Return the paths of the containers.
+    """
+    registry = SchemaRegistry(schema_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    output_paths = []
+    for path in collect_files(example_dir):
+        if path.endswith(".a205.json"):
+            representation = load_json(path)
+            output_path = os.path.join(output_dir, os.path.basename(path)[: -len(".json")] + ".col")
+            dump_columnar(representation, registry.get_for_instance(representation), output_path, float32)
+            output_paths.append(output_path)
+    return output_paths
@@ -4,7 +4,7 @@ from schema205.file_io import dump
 from schema205.cpp_entries import CPP_translator
 from schema205.generate_factory_templates import (generate_factory_headers, 
                                                   generate_factory_source)
-from schema205.util import snake_style
+from schema205.util import snake_style, run_in_pool
 
 # -------------------------------------------------------------------------------------------------
 def translate_to_header(input_file_path, output_file_root, base_class='foo_base', container=''):
@@ -38,21 +38,43 @@ def translate_all_to_headers(input_dir_path, output_dir_path, container=''):
         dump(str(h), os.path.join(output_dir_path, file_name_root + '.h'))
 
 # -------------------------------------------------------------------------------------------------
-def translate_all_to_source(input_dir_path, output_header_dir, output_src_dir, container=''):
+def translate_all_to_source(input_dir_path, output_header_dir, output_src_dir, container='', jobs=1):
     src_files = [src for src in sorted(os.listdir(input_dir_path)) if '.schema.yaml' in src]
-    h = H_translator()
-    c = CPP_translator()
-    for file_name in src_files:
-        file_name_root = os.path.splitext(os.path.splitext(file_name)[0])[0]
-        h.translate(os.path.join(input_dir_path, file_name), container, 'RSInstanceBase')
-        dump(str(h), os.path.join(output_header_dir, snake_style(file_name_root) + '.h'))
-        c.translate(container, h)
-        dump(str(c), os.path.join(output_src_dir, snake_style(file_name_root) + '.cpp'))
-        if 'RS' in file_name_root:
-            factory_header = generate_factory_headers(file_name_root, 'RSInstance', container)
-            dump(factory_header, os.path.join(output_header_dir, snake_style(file_name_root) + '_factory.h'))
-            factory_src = generate_factory_source(file_name_root, 'RSInstance', container, 'ASHRAE205')
-            dump(factory_src, os.path.join(output_src_dir, snake_style(file_name_root) + '_factory.cpp'))
+    translate_files_to_source([os.path.join(input_dir_path, src) for src in src_files],
+                              output_header_dir, output_src_dir, container, jobs)
+
+# -------------------------------------------------------------------------------------------------
+def _create_translators():
+    '''Create the translators once per worker process.'''
+    return H_translator(), CPP_translator()
+
+def _translate_file_to_source(translators, arguments):
+    '''
+    Write the header and source (and, for RS schemas, the factory header and source) of one schema
+    using the worker's translators (see _create_translators). Each file's outputs depend only on its own source and the sources
+    it references, so files can be translated in any order or process.
+    '''
+    input_file_path, output_header_dir, output_src_dir, container = arguments
+    h, c = translators
+    file_name_root = os.path.splitext(os.path.splitext(os.path.basename(input_file_path))[0])[0]
+    h.translate(input_file_path, container, 'RSInstanceBase')
+    dump(str(h), os.path.join(output_header_dir, snake_style(file_name_root) + '.h'))
+    c.translate(container, h)
+    dump(str(c), os.path.join(output_src_dir, snake_style(file_name_root) + '.cpp'))
+    if 'RS' in file_name_root:
+        factory_header = generate_factory_headers(file_name_root, 'RSInstance', container)
+        dump(factory_header, os.path.join(output_header_dir, snake_style(file_name_root) + '_factory.h'))
+        factory_src = generate_factory_source(file_name_root, 'RSInstance', container, 'ASHRAE205')
+        dump(factory_src, os.path.join(output_src_dir, snake_style(file_name_root) + '_factory.cpp'))
+
+# -------------------------------------------------------------------------------------------------
+def translate_files_to_source(input_file_paths, output_header_dir, output_src_dir, container='', jobs=1):
+    '''
+    :param jobs:    Number of worker processes. If None, use the number of available CPUs. Outputs
+                    are identical for any number of jobs.
+    '''
+    tasks = [(path, output_header_dir, output_src_dir, container) for path in input_file_paths]
+    run_in_pool(_translate_file_to_source, tasks, jobs, _create_translators)
     # lib_h, lib_cpp = generate_library_files(
     #     [os.path.splitext(os.path.splitext(f)[0])[0] for f in [s for s in  src_files if 'RS' in s]])
     # dump(lib_h, os.path.join(output_header_dir, 'libtk205.h'))
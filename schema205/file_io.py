@@ -1,6 +1,85 @@
 import json
 import yaml
 import os
+import re
+import array
+import struct
+import itertools
+import copy
+import threading
+import hashlib
+import pickle
+from collections.abc import Mapping
+
+# Parsed schema sources (see load_source) are kept on disk in this directory, one entry per source
+# file, when it is set (e.g., with the SCHEMA205_SOURCE_CACHE environment variable). Disabled (None)
+# by default.
+SOURCE_CACHE_DIR = os.environ.get('SCHEMA205_SOURCE_CACHE') or None
+SOURCE_CACHE_VERSION = f"2-{yaml.__version__}"
+
+
+def is_private_dir(dir_path):
+    """Return True if dir_path is a directory that only its owner, the current user, can write to."""
+    stat = os.stat(dir_path)
+    if not hasattr(os, 'getuid'):  # e.g., Windows, which has no POSIX ownership or modes
+        return True
+    return stat.st_uid == os.getuid() and not (stat.st_mode & 0o022)
+
+
+def read_cache_entry(entry_path):
+    """
+    Return the (key, content) pair pickled in the cache entry at entry_path, or None if the entry is
+    missing or unreadable (e.g., written by another version of its content's classes).
+
+    Entries are only read from a directory that no other user can write to, since loading an entry
+    unpickles it.
+    """
+    try:
+        if is_private_dir(os.path.dirname(entry_path)):
+            with open(entry_path, 'rb') as entry_file:
+                return pickle.load(entry_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, TypeError):
+        pass
+    return None
+
+
+def write_cache_entry(entry_path, key, content):
+    """
+    Write (key, content) to the cache entry at entry_path, creating its directory (private to the
+    current user) if needed. Nothing is written if the directory can't be written or is not private.
+    """
+    cache_dir = os.path.dirname(entry_path)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        if is_private_dir(cache_dir):
+            temporary_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}"
+            with open(temporary_path, 'wb') as entry_file:
+                pickle.dump((key, content), entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, entry_path)  # Concurrent processes never read partial entries
+    except OSError:
+        pass  # e.g., an unwritable directory; the content is rebuilt every time
+
+
+def load_cached_yaml(input_file_path):
+    """
+    Return the content of a YAML file, using its entry in SOURCE_CACHE_DIR if the file has not changed
+    since the entry was written. Each file has a single entry (named after a hash of its absolute
+    path) holding a hash of the file's content, which is replaced whenever the content changes.
+    """
+    with open(input_file_path, 'rb') as input_file:
+        text = input_file.read()
+    if SOURCE_CACHE_DIR is None:
+        return yaml.load(text.decode('utf-8'), Loader=yaml.FullLoader)
+    digest = hashlib.sha256(SOURCE_CACHE_VERSION.encode() + b'\0' + text).hexdigest()
+    cache_name = hashlib.sha256(os.path.abspath(input_file_path).encode()).hexdigest()
+    cache_path = os.path.join(SOURCE_CACHE_DIR, f"{cache_name}.pickle")
+    entry = read_cache_entry(cache_path)
+    if entry is not None and entry[0] == digest:
+        return entry[1]
+    content = yaml.load(text.decode('utf-8'), Loader=yaml.FullLoader)
+    write_cache_entry(cache_path, digest, content)
+    return content
+
 
 def load_json(input_file_path):
   with open(input_file_path, 'r') as input_file:
@@ -18,6 +97,8 @@ def load(input_file_path):
     elif (ext == '.yaml') or (ext == '.yml'):
         with open(input_file_path, 'r') as input_file:
             return yaml.load(input_file, Loader=yaml.FullLoader)
+    elif ext == '.cbor':
+        return load_cbor(input_file_path)
     else:
         raise Exception(f"Unsupported input \"{ext}\".")
 
@@ -30,6 +111,9 @@ def dump(content, output_file_path):
     elif (ext == '.yaml') or (ext == '.yml'):
         with open(output_file_path, 'w') as out_file:
             yaml.dump(content, out_file, sort_keys=False)
+    elif ext == '.cbor':
+        with open(output_file_path, 'wb') as out_file:
+            out_file.write(cbor_dumps(content))
     elif ext == '.h':
         with open(output_file_path, 'w') as header:
             header.write(content)
@@ -43,3 +127,427 @@ def dump(content, output_file_path):
         raise Exception(f"Unsupported output \"{ext}\".")
 
 
+class FrozenDict(dict):
+    """
+    Read-only dict, as handed out by load_source. copy(), copy.copy and copy.deepcopy return mutable
+    (plain dict and list) copies.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Parsed source trees are read-only; modify a copy instead.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list, as handed out by load_source (see FrozenDict)."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Parsed source trees are read-only; modify a copy instead.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(content):
+    """Return a read-only (FrozenDict and FrozenList) copy of loaded content."""
+    if isinstance(content, dict):
+        return FrozenDict((key, freeze(value)) for key, value in content.items())
+    if isinstance(content, list):
+        return FrozenList(freeze(item) for item in content)
+    return content
+
+
+_source_cache = {}  # absolute path -> (modification time, size, parsed tree)
+_source_cache_lock = threading.Lock()
+
+
+def load_source(input_file_path):
+    """
+    Return the read-only parsed tree of a source file (e.g., a *.schema.yaml file), parsing each file
+    at most once per process for as long as its modification time and size are unchanged. YAML sources
+    are also cached between processes if SOURCE_CACHE_DIR is set (see load_cached_yaml).
+    """
+    path = os.path.abspath(input_file_path)
+    stat = os.stat(path)
+    with _source_cache_lock:
+        entry = _source_cache.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+    if get_extension(path).lower() in ('.yaml', '.yml'):
+        tree = freeze(load_cached_yaml(path))
+    else:
+        tree = freeze(load(path))
+    with _source_cache_lock:
+        _source_cache[path] = (stat.st_mtime_ns, stat.st_size, tree)
+    return tree
+
+
+def clear_source_cache():
+    with _source_cache_lock:
+        _source_cache.clear()
+
+
+# CBOR (RFC 8949), as read by tk205::load_json (nlohmann::json::from_cbor). Only untagged data items
+# are written, since nlohmann::json rejects tags by default.
+
+CBOR_FLOAT64 = 0xFB
+CBOR_FLOAT32 = 0xFA
+CBOR_SIMPLE_VALUES = {20: False, 21: True, 22: None, 23: None}
+CBOR_SELF_DESCRIBED = 55799
+# RFC 8746 typed arrays of floats (big-endian, little-endian), read but never written
+CBOR_TYPED_FLOAT_ARRAYS = {81: ">f", 82: ">d", 85: "<f", 86: "<d"}
+
+
+def cbor_head(major_type, argument):
+    """Return the initial byte(s) of a data item with the given major type and argument."""
+    major_type <<= 5
+    if argument < 24:
+        return bytes((major_type | argument,))
+    elif argument < 0x100:
+        return struct.pack(">BB", major_type | 24, argument)
+    elif argument < 0x10000:
+        return struct.pack(">BH", major_type | 25, argument)
+    elif argument < 0x100000000:
+        return struct.pack(">BI", major_type | 26, argument)
+    elif argument < 0x10000000000000000:
+        return struct.pack(">BQ", major_type | 27, argument)
+    raise Exception(f"Integer {argument} is too large for CBOR encoding.")
+
+
+def cbor_encode_floats(values, output):
+    """Encode a sequence of floats as an array of float64 items with a single struct.pack call."""
+    output.append(cbor_head(4, len(values)))
+    items = itertools.chain.from_iterable(zip(itertools.repeat(CBOR_FLOAT64), values))
+    output.append(struct.pack(">" + "Bd" * len(values), *items))
+
+
+def is_float_array(values):
+    """
+    Return True for arrays of floats, possibly mixed with integers that floats represent exactly (JSON
+    numbers such as 0 among floats), which are encoded as float64 arrays.
+    """
+    types = set(map(type, values))
+    return (
+        float in types
+        and types.issubset({float, int})
+        and (int not in types or all(abs(value) <= 2**53 for value in values if type(value) is int))
+    )
+
+
+def cbor_encode(content, output):
+    content_type = type(content)
+    if content_type is str:
+        encoded = content.encode('utf-8')
+        output.append(cbor_head(3, len(encoded)))
+        output.append(encoded)
+    elif content_type is bool:
+        output.append(b'\xf5' if content else b'\xf4')
+    elif isinstance(content, float):
+        output.append(struct.pack(">Bd", CBOR_FLOAT64, content))
+    elif isinstance(content, int):
+        output.append(cbor_head(0, content) if content >= 0 else cbor_head(1, -1 - content))
+    elif content is None:
+        output.append(b'\xf6')
+    elif isinstance(content, (list, tuple, array.array)):
+        if isinstance(content, array.array) and content.typecode in "fd" or is_float_array(content):
+            cbor_encode_floats(content, output)
+        else:
+            output.append(cbor_head(4, len(content)))
+            for item in content:
+                cbor_encode(item, output)
+    elif isinstance(content, Mapping):
+        output.append(cbor_head(5, len(content)))
+        for key, value in content.items():
+            cbor_encode(key, output)
+            cbor_encode(value, output)
+    elif isinstance(content, (bytes, bytearray)):
+        output.append(cbor_head(2, len(content)))
+        output.append(bytes(content))
+    else:
+        raise Exception(f"Cannot encode {content_type.__name__} as CBOR.")
+
+
+def cbor_dumps(content):
+    """
+    Return the CBOR encoding of JSON-like content. Floats are always encoded as float64, as are
+    integers within arrays of floats (see is_float_array).
+    """
+    output = []
+    cbor_encode(content, output)
+    return b''.join(output)
+
+
+class CBORDecoder:
+    """
+    Decoder of a CBOR data item. Arrays whose items are all float64 (or all float32) items are
+    decoded with a single struct.unpack_from call.
+    """
+
+    _PACKED_FLOATS = {CBOR_FLOAT64: (9, "xd"), CBOR_FLOAT32: (5, "xf")}
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read_argument(self, additional_information):
+        if additional_information < 24:
+            return additional_information
+        if additional_information > 27:
+            raise Exception(f"Invalid CBOR: unexpected additional information {additional_information}.")
+        size = 1 << (additional_information - 24)
+        argument = int.from_bytes(self.data[self.pos : self.pos + size], 'big')
+        self.pos += size
+        return argument
+
+    def read_bytes(self, length):
+        if self.pos + length > len(self.data):
+            raise Exception("Invalid CBOR: unexpected end of data.")
+        value = self.data[self.pos : self.pos + length]
+        self.pos += length
+        return value
+
+    def read_chunks(self, major_type):
+        """Read the chunks of an indefinite-length byte or text string."""
+        chunks = []
+        while self.data[self.pos] != 0xFF:
+            chunk = self.decode()
+            if type(chunk) is not (bytes if major_type == 2 else str):
+                raise Exception("Invalid CBOR: unexpected chunk in indefinite-length string.")
+            chunks.append(chunk)
+        self.pos += 1
+        return (b'' if major_type == 2 else '').join(chunks)
+
+    def read_array(self, length):
+        data = self.data
+        if length > 1:
+            packed = self._PACKED_FLOATS.get(data[self.pos])
+            if packed is not None:
+                item_size, item_format = packed
+                end = self.pos + item_size * length
+                if end <= len(data) and data[self.pos : end : item_size] == data[self.pos : self.pos + 1] * length:
+                    values = list(struct.unpack_from(">" + item_format * length, data, self.pos))
+                    self.pos = end
+                    return values
+        return [self.decode() for _ in range(length)]
+
+    def decode(self):
+        data = self.data
+        pos = self.pos
+        if pos >= len(data):
+            raise Exception("Invalid CBOR: unexpected end of data.")
+        initial_byte = data[pos]
+        if 0x60 <= initial_byte < 0x78:  # Short text string (e.g., keys and enumerators)
+            end = pos + 1 + initial_byte - 0x60
+            if end > len(data):
+                raise Exception("Invalid CBOR: unexpected end of data.")
+            self.pos = end
+            return str(data[pos + 1 : end], 'utf-8')
+        self.pos = pos + 1
+        major_type, additional_information = initial_byte >> 5, initial_byte & 0x1F
+        if major_type == 7:
+            if additional_information == 27:
+                return struct.unpack(">d", self.read_bytes(8))[0]
+            elif additional_information == 26:
+                return struct.unpack(">f", self.read_bytes(4))[0]
+            elif additional_information == 25:
+                return struct.unpack(">e", self.read_bytes(2))[0]
+            elif additional_information in CBOR_SIMPLE_VALUES:
+                return CBOR_SIMPLE_VALUES[additional_information]
+            raise Exception(f"Invalid CBOR: unsupported simple value {additional_information}.")
+        if additional_information == 31:  # Indefinite length
+            if major_type in (2, 3):
+                return self.read_chunks(major_type)
+            elif major_type == 4:
+                items = []
+                while self.data[self.pos] != 0xFF:
+                    items.append(self.decode())
+                self.pos += 1
+                return items
+            elif major_type == 5:
+                items = {}
+                while self.data[self.pos] != 0xFF:
+                    key = self.decode()
+                    items[key] = self.decode()
+                self.pos += 1
+                return items
+            raise Exception(f"Invalid CBOR: major type {major_type} cannot have an indefinite length.")
+        argument = self.read_argument(additional_information)
+        if major_type == 0:
+            return argument
+        elif major_type == 1:
+            return -1 - argument
+        elif major_type == 2:
+            return bytes(self.read_bytes(argument))
+        elif major_type == 3:
+            return str(self.read_bytes(argument), 'utf-8')
+        elif major_type == 4:
+            return self.read_array(argument)
+        elif major_type == 5:
+            items = {}
+            for _ in range(argument):
+                key = self.decode()
+                items[key] = self.decode()
+            return items
+        # Major type 6: tags
+        if argument == CBOR_SELF_DESCRIBED:
+            return self.decode()
+        if argument in CBOR_TYPED_FLOAT_ARRAYS:
+            packed = self.decode()
+            if type(packed) is not bytes:
+                raise Exception("Invalid CBOR: typed array content is not a byte string.")
+            item_format = CBOR_TYPED_FLOAT_ARRAYS[argument]
+            count = len(packed) // struct.calcsize(item_format)
+            return list(struct.unpack(f"{item_format[0]}{count}{item_format[1]}", packed))
+        raise Exception(f"Unsupported CBOR tag {argument}.")
+
+
+def cbor_loads(data):
+    """Return the content of CBOR-encoded data (a single data item)."""
+    decoder = CBORDecoder(data)
+    content = decoder.decode()
+    if decoder.pos != len(data):
+        raise Exception("Invalid CBOR: unexpected data after the first data item.")
+    return content
+
+
+def load_cbor(input_file_path):
+    with open(input_file_path, 'rb') as input_file:
+        return cbor_loads(input_file.read())
+
+
+class JSONStream:
+    """
+    Pull parser that reads a JSON file incrementally.
+
+    Only the text of the value currently being read (plus one chunk) is held in memory. Objects
+    may be traversed member by member with iter_object(); each member value must then be consumed
+    with read_value(), skip_value() or a nested iter_object() before advancing to the next key.
+    """
+
+    _WHITESPACE = re.compile(r"\s*")
+    _STRUCTURE = re.compile(r'["{}\[\]]')
+    _STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+    _SCALAR = re.compile(r"[^\s,\]}]*")
+    _DECODER = json.JSONDecoder()
+
+    def __init__(self, input_file, chunk_size=65536):
+        self._file = input_file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self, size=None):
+        """Read the next chunk, discarding everything before the current position."""
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end of the file)."""
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters):
+        c = self.peek()
+        if c == "" or c not in characters:
+            raise Exception(f"Invalid JSON: expected one of '{characters}' but found '{c}'.")
+        self._pos += 1
+        return c
+
+    def _scan_value(self):
+        """Return the length of the JSON value starting at the current position."""
+        c = self.peek()
+        if c == "":
+            raise Exception("Invalid JSON: unexpected end of file.")
+        offset = 0  # relative to self._pos, which may move when the buffer is refilled
+        depth = 0
+        read_size = self._chunk_size
+        while True:
+            start = self._pos
+            i = start + offset
+            if c not in '{["':
+                m = self._SCALAR.match(self._buffer, i)
+                if m.end() < len(self._buffer):
+                    return m.end() - start
+            else:
+                while True:
+                    m = self._STRUCTURE.search(self._buffer, i)
+                    if m is None:
+                        i = len(self._buffer)
+                        break
+                    if m.group() == '"':
+                        string_end = self._STRING_END.match(self._buffer, m.end())
+                        if string_end is None:
+                            i = m.start()  # rescan the partial string after refilling
+                            break
+                        i = string_end.end()
+                    elif m.group() in "{[":
+                        depth += 1
+                        i = m.end()
+                    else:
+                        depth -= 1
+                        i = m.end()
+                    if depth == 0:
+                        return i - start
+            offset = i - start
+            read_size *= 2  # grow geometrically so that large values are not copied repeatedly
+            if not self._fill(read_size):
+                if c not in '{["':
+                    return len(self._buffer) - start
+                raise Exception("Invalid JSON: unexpected end of file.")
+
+    def read_value(self):
+        """Parse and return the next value."""
+        length = self._scan_value()
+        value, end = self._DECODER.raw_decode(self._buffer, self._pos)
+        if end != self._pos + length:
+            raise Exception("Invalid JSON: unexpected characters after value.")
+        self._pos = end
+        return value
+
+    def skip_value(self):
+        """Advance past the next value without parsing it."""
+        length = self._scan_value()  # may refill the buffer and move the position
+        self._pos += length
+
+    def iter_object(self):
+        """Yield the keys of the object starting at the current position."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise Exception("Invalid JSON: expected an object key.")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
@@ -1,7 +1,7 @@
 import os
 import re
 from pathlib import Path
-from schema205.file_io import load
+from schema205.file_io import load_source
 from schema205.util import snake_style
 
 
@@ -654,7 +654,7 @@ class H_translator:
         self._preamble.clear()
         self._epilogue.clear()
 
-        self._contents = load(input_file_path)
+        self._contents = load_source(input_file_path)
 
         self._fundamental_base_class = (
             schema_base_class_name if schema_base_class_name else "RSInstanceBase"
@@ -848,7 +848,7 @@ class H_translator:
         )  # prepend the current file to references list so that
         # objects are found locally first
         for ref_file in refs:
-            ext_dict = load(
+            ext_dict = load_source(
                 self._source_dir.joinpath(ref_file).with_suffix(".schema.yaml")
             )  # load(os.path.join(self._source_dir, ref_file + '.schema.yaml'))
             external_objects = list()
@@ -0,0 +1,437 @@
+"""
+Evaluation of RS performance maps, modeled on the generated C++ (PerformanceMapBase, which uses a
+Btwxt::RegularGridInterpolator): grid axes in schema order, linear or cubic (Hermite) interpolation
+within the grid and constant extrapolation beyond it.
+
+Results are checked against functions the interpolation reproduces exactly (multilinear, or
+quadratic for cubic axes) and against clamped targets beyond the grid, not against Btwxt itself.
+"""
+import array
+import bisect
+import itertools
+from collections.abc import Mapping
+import numpy as np
+from .util import get_representation_node
+
+LINEAR = "linear"
+CUBIC = "cubic"
+
+
+def hermite_slopes(axis, values, dimension):
+    """
+    Return the slopes of values along an axis (the given dimension of values) for cubic Hermite
+    interpolation: centered differences across the two neighboring intervals, or the difference
+    across the single neighboring interval at either end of the axis.
+    """
+    values = np.moveaxis(values, dimension, 0)
+    slopes = np.zeros(values.shape)
+    if len(axis) > 1:
+        spacing = np.reshape(axis[2:] - axis[:-2], (-1,) + (1,) * (values.ndim - 1))
+        slopes[1:-1] = (values[2:] - values[:-2]) / spacing
+        slopes[0] = (values[1] - values[0]) / (axis[1] - axis[0])
+        slopes[-1] = (values[-1] - values[-2]) / (axis[-1] - axis[-2])
+    return np.moveaxis(slopes, 0, dimension)
+
+
+class RegularGridInterpolator:
+    """
+    Interpolation of one or more data sets defined on the points of a regular grid.
+    """
+
+    def __init__(self, axes, data_sets):
+        """
+        :param axes:        Sequence of strictly increasing grid axes
+        :param data_sets:   Sequence of data sets, each with one value per grid point (the last axis
+                            varying fastest, as in 'lookup_variables')
+        """
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.ndim = len(self.axes)
+        size = int(np.prod(self.shape))
+        for axis in self.axes:
+            if len(axis) == 0 or (np.diff(axis) <= 0).any():
+                raise Exception(f"Grid axis {axis.tolist()} is not strictly increasing.")
+        # One row of data set values per grid point
+        self.table = np.array(data_sets, dtype=float).reshape(-1, size).T.copy()
+        if self.table.shape[0] != size:
+            raise Exception(f"Data sets must have {size} values (the number of grid points).")
+        self.strides = np.array([int(np.prod(self.shape[i + 1 :])) for i in range(self.ndim)], dtype=np.intp)
+        # Axes with more than one point define the vertices of the interpolation hypercube
+        self._varying_axes = [i for i, length in enumerate(self.shape) if length > 1]
+        self._vertices = list(itertools.product((0, 1), repeat=len(self._varying_axes)))
+        self._hermite_tables = {}  # Cubic axes -> table of values and slopes
+
+    def get_hermite_table(self, cubic_axes):
+        """
+        Return the values and slopes needed for cubic interpolation along cubic_axes, with shape
+        (number of grid points, 2**len(cubic_axes), number of data sets). The second dimension holds
+        the derivatives along each subset of cubic_axes (e.g., [value, d/dy, d/dx, d2/dxdy] for axes
+        (x, y)). Tables are computed once for each combination of cubic axes.
+        """
+        if cubic_axes not in self._hermite_tables:
+            data = self.table.T.reshape((-1,) + self.shape)
+            tables = [data]
+            for axis in cubic_axes:
+                # Derivatives of each existing table along this axis follow the existing tables
+                tables = [
+                    table
+                    for existing in tables
+                    for table in (existing, hermite_slopes(self.axes[axis], existing, axis + 1))
+                ]
+            self._hermite_tables[cubic_axes] = np.stack(
+                [table.reshape(len(data), -1).T for table in tables], axis=1
+            )
+        return self._hermite_tables[cubic_axes]
+
+    def get_cubic_axes(self, methods):
+        """Return the axes interpolated with cubic Hermite interpolation for a list of methods."""
+        if methods is None:
+            return ()
+        # Cubic interpolation along two-point axes is identical to linear interpolation
+        return tuple(i for i in self._varying_axes if methods[i] == CUBIC and self.shape[i] > 2)
+
+    def get_target_weights(self, indices, fractions, methods=None):
+        """
+        Return the interpolation weights of a single target from its indices and fractions (ndim).
+
+        Returns (rows, weights, table): the interpolated data sets are the sum of weights (vertices, T)
+        times table[rows] (vertices, T, n_data_sets).
+        """
+        cubic_axes = self.get_cubic_axes(methods)
+        if len(cubic_axes) > 0:
+            table = self.get_hermite_table(cubic_axes)
+        else:
+            table = self.table[:, np.newaxis, :]
+        vertices = np.array(self._vertices, dtype=np.intp).reshape(len(self._vertices), -1)
+        rows = int(indices @ self.strides) + vertices @ self.strides[self._varying_axes]
+        weights = np.ones((len(vertices), 1))
+        for j, axis in enumerate(self._varying_axes):
+            mu = fractions[axis]
+            upper = vertices[:, j]
+            if axis in cubic_axes:
+                width = self.axes[axis][indices[axis] + 1] - self.axes[axis][indices[axis]]
+                basis = np.array(
+                    [
+                        [(2.0 * mu - 3.0) * mu * mu + 1.0, ((mu - 2.0) * mu + 1.0) * mu * width],
+                        [(3.0 - 2.0 * mu) * mu * mu, (mu - 1.0) * mu * mu * width],
+                    ]
+                )[upper]
+                weights = (weights[:, :, np.newaxis] * basis[:, np.newaxis, :]).reshape(len(vertices), -1)
+            else:
+                weights = weights * np.where(upper, mu, 1.0 - mu)[:, np.newaxis]
+        return rows, weights, table
+
+    def locate(self, targets):
+        """
+        Return the indices of the grid points below each target (N, ndim) and the fractions of the
+        distance to the next grid point (N, ndim), limited to [0, 1] beyond the grid.
+        """
+        indices = np.zeros(targets.shape, dtype=np.intp)
+        fractions = np.zeros(targets.shape)
+        for i in self._varying_axes:
+            axis = self.axes[i]
+            floor = np.clip(np.searchsorted(axis, targets[:, i], side="right") - 1, 0, len(axis) - 2)
+            lower = axis[floor]
+            indices[:, i] = floor
+            fractions[:, i] = np.clip((targets[:, i] - lower) / (axis[floor + 1] - lower), 0.0, 1.0)
+        return indices, fractions
+
+    def interpolate(self, indices, fractions, methods=None):
+        """
+        Return the interpolated data sets (N, n_data_sets) from the results of locate.
+
+        :param methods: Interpolation method (LINEAR or CUBIC) of each axis. Default is LINEAR.
+        """
+        cubic_axes = self.get_cubic_axes(methods)
+        if len(cubic_axes) > 0:
+            return self._interpolate_cubic(indices, fractions, cubic_axes)
+        base = indices @ self.strides
+        results = np.zeros((len(base), self.table.shape[1]))
+        for vertex in self._vertices:
+            weights = np.ones(len(base))
+            offset = 0
+            for axis, upper in zip(self._varying_axes, vertex):
+                weights *= fractions[:, axis] if upper else 1.0 - fractions[:, axis]
+                offset += upper * self.strides[axis]
+            results += weights[:, np.newaxis] * self.table[base + offset]
+        return results
+
+    def _interpolate_cubic(self, indices, fractions, cubic_axes):
+        """
+        Cubic (Hermite) interpolation along cubic_axes and linear interpolation along the other axes.
+
+        The values and slopes at every vertex of each target's cell are gathered from the Hermite table
+        with one indexed read and multiplied by the product of the (separable) weights along each axis.
+        Each target reads 2**len(cubic_axes) times as many values as with linear interpolation, so the
+        cost grows with the number of cubic axes and is bound by the memory traffic of the gathered
+        values: on the six-axis HPDM cooling map, cubic interpolation along its two temperature axes
+        takes about 1.5 times as long as linear interpolation, and along all five axes with more than
+        two points (32 times as many values per target) about 6-7 times as long (see
+        benchmarks/interpolation.py).
+        """
+        table = self.get_hermite_table(cubic_axes)
+        vertices = np.array(self._vertices, dtype=np.intp).reshape(len(self._vertices), -1)
+        offsets = vertices @ self.strides[self._varying_axes]
+        results = np.empty((len(indices), table.shape[2]))
+        # Gathered values are processed in chunks of targets to bound memory use
+        chunk_size = max(1, (1 << 20) // table[0].size // len(offsets))
+        for start in range(0, len(indices), chunk_size):
+            chunk_indices = indices[start : start + chunk_size]
+            chunk_fractions = fractions[start : start + chunk_size]
+            n = len(chunk_indices)
+            # Weight (targets, vertices, derivatives) of each vertex (the first axis varying slowest) and
+            # derivative (in the order of get_hermite_table): the product of the weights along each axis,
+            # built from the last axis so that each axis adds the most significant vertex (and
+            # derivative) bit
+            weights = np.ones((n, 1, 1))
+            for axis in reversed(self._varying_axes):
+                mu = chunk_fractions[:, axis]
+                if axis in cubic_axes:
+                    index = chunk_indices[:, axis]
+                    width = self.axes[axis][index + 1] - self.axes[axis][index]
+                    # Value and (interval-scaled) slope weights at each end of the cell
+                    axis_weights = np.empty((n, 2, 1, 2, 1))
+                    axis_weights[:, 0, 0, 0, 0] = (2.0 * mu - 3.0) * mu * mu + 1.0
+                    axis_weights[:, 0, 0, 1, 0] = ((mu - 2.0) * mu + 1.0) * mu * width
+                    axis_weights[:, 1, 0, 0, 0] = (3.0 - 2.0 * mu) * mu * mu
+                    axis_weights[:, 1, 0, 1, 0] = (mu - 1.0) * mu * mu * width
+                    weights = (axis_weights * weights[:, np.newaxis, :, np.newaxis, :]).reshape(
+                        n, 2 * weights.shape[1], -1
+                    )
+                else:
+                    axis_weights = np.stack([1.0 - mu, mu], axis=1)[:, :, np.newaxis, np.newaxis]
+                    weights = (axis_weights * weights[:, np.newaxis]).reshape(n, 2 * weights.shape[1], -1)
+            # (targets, vertices, derivatives, data sets)
+            values = table[(chunk_indices @ self.strides)[:, np.newaxis] + offsets]
+            values = values.reshape(n, -1, table.shape[2])
+            results[start : start + n] = np.matmul(weights.reshape(n, 1, -1), values)[:, 0]
+        return results
+
+    def __call__(self, targets, methods=LINEAR):
+        """
+        Return the interpolated data sets (N, n_data_sets) at the targets (N, ndim).
+
+        :param methods: Interpolation method (LINEAR or CUBIC) for all axes, or a sequence with the
+                        method of each axis
+        """
+        targets = np.atleast_2d(np.asarray(targets, dtype=float))
+        if targets.shape[1] != self.ndim:
+            raise Exception(f"Targets must have {self.ndim} values (the number of grid axes).")
+        if isinstance(methods, str):
+            methods = [methods] * self.ndim
+        return self.interpolate(*self.locate(targets), methods)
+
+
+class SequentialQuery:
+    """
+    Evaluation of single targets that change little from one query to the next, e.g., one query per
+    simulation timestep.
+
+    The grid cell of the previous target is tried first, then its neighbors, before searching each
+    axis. The interpolation weights of the previous target are reused when a target repeats.
+
+    A query keeps state between calls and must only be used by one thread. Any number of queries can
+    share an interpolator, which they do not modify.
+    """
+
+    def __init__(self, interpolator, methods=LINEAR):
+        self.interpolator = interpolator
+        if isinstance(methods, str):
+            methods = [methods] * interpolator.ndim
+        self.methods = list(methods)
+        self.axes = [axis.tolist() for axis in interpolator.axes]
+        self.hints = [0] * interpolator.ndim  # Index of the grid point below the last target
+        self.searches = 0  # Number of axis lookups that fell back to a binary search
+        self._target = None
+        self._weights = None
+        # Compute any slope tables now, rather than while sharing the interpolator
+        cubic_axes = interpolator.get_cubic_axes(self.methods)
+        if cubic_axes:
+            interpolator.get_hermite_table(cubic_axes)
+
+    def locate_axis(self, axis_index, value):
+        axis = self.axes[axis_index]
+        last = len(axis) - 2  # Highest index of a grid point below a cell
+        i = self.hints[axis_index]
+        in_cell = (axis[i] <= value or i == 0) and (value < axis[i + 1] or i == last)
+        if not in_cell:
+            if i < last and axis[i + 1] <= value < axis[i + 2]:
+                i += 1
+            elif i > 0 and axis[i - 1] <= value < axis[i]:
+                i -= 1
+            else:
+                self.searches += 1
+                i = min(max(bisect.bisect_right(axis, value) - 1, 0), last)
+            self.hints[axis_index] = i
+        return i, min(max((value - axis[i]) / (axis[i + 1] - axis[i]), 0.0), 1.0)
+
+    def __call__(self, target):
+        """
+        Return the interpolated data sets (n_data_sets) at a target (ndim).
+        """
+        target = tuple(target)
+        if target != self._target:
+            if len(target) != self.interpolator.ndim:
+                raise Exception(
+                    f"Targets must have {self.interpolator.ndim} values (the number of grid axes)."
+                )
+            indices = np.zeros(self.interpolator.ndim, dtype=np.intp)
+            fractions = np.zeros(self.interpolator.ndim)
+            for i in self.interpolator._varying_axes:
+                indices[i], fractions[i] = self.locate_axis(i, target[i])
+            self._weights = self.interpolator.get_target_weights(indices, fractions, self.methods)
+            self._target = target
+        rows, weights, table = self._weights
+        return np.einsum("vt,vtd->d", weights, table[rows])
+
+
+class MapView(Mapping):
+    """
+    N-D arrays of the lookup variables of a performance map, shaped by its grid axes (in schema
+    order). As a mapping, each lookup variable gives its array.
+
+    Selections (isel, sel) return new MapViews of the same data: arrays are NumPy views, never copies,
+    and are read-only (see readonly_view). Fixing a grid variable at a single point removes its axis.
+    """
+
+    def __init__(self, axes, data):
+        """
+        :param axes:    Dictionary of grid variable -> axis array, in grid order
+        :param data:    Dictionary of lookup variable -> array shaped by the axes
+        """
+        self.axes = {name: readonly_view(axis) for name, axis in axes.items()}
+        self.data = {name: readonly_view(values) for name, values in data.items()}
+
+    @property
+    def grid_variable_names(self):
+        return list(self.axes)
+
+    @property
+    def shape(self):
+        return tuple(len(axis) for axis in self.axes.values())
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"MapView({dict(zip(self.axes, self.shape))!r}, {list(self.data)!r})"
+
+    def isel(self, **indexers):
+        """
+        Select by position along grid variables: an integer fixes the grid variable at one point
+        (removing its axis) and a slice keeps a range of points, e.g.,
+        isel(compressor_sequence_number=0, outdoor_coil_entering_dry_bulb_temperature=slice(2, None)).
+        """
+        for name in indexers:
+            if name not in self.axes:
+                raise Exception(f"'{name}' is not a grid variable of this map: {list(self.axes)}")
+        key = tuple(indexers.get(name, slice(None)) for name in self.axes)
+        axes = {
+            name: axis[index]
+            for (name, axis), index in zip(self.axes.items(), key)
+            if isinstance(index, slice)
+        }
+        return MapView(axes, {name: values[key] for name, values in self.data.items()})
+
+    def sel(self, **indexers):
+        """
+        Select by grid variable value: a value (which must be on the axis) fixes the grid variable at
+        that point and a slice of values keeps the points within its (inclusive) bounds.
+        """
+        positions = {}
+        for name, indexer in indexers.items():
+            if name not in self.axes:
+                raise Exception(f"'{name}' is not a grid variable of this map: {list(self.axes)}")
+            axis = self.axes[name]
+            if isinstance(indexer, slice):
+                start = None if indexer.start is None else int(np.searchsorted(axis, indexer.start, "left"))
+                stop = None if indexer.stop is None else int(np.searchsorted(axis, indexer.stop, "right"))
+                positions[name] = slice(start, stop)
+            else:
+                matches = np.flatnonzero(np.isclose(axis, indexer, rtol=1e-12, atol=0.0))
+                if len(matches) == 0:
+                    raise Exception(f"{indexer} is not a value of grid variable '{name}': {axis.tolist()}")
+                positions[name] = int(matches[0])
+        return self.isel(**positions)
+
+
+def readonly_view(values):
+    """
+    Return a read-only view of a NumPy array (or array-like). The protection is shallow: it applies to
+    the view (and any view taken of it), not to the array it was taken from, which stays writable and
+    whose changes the view reflects. The view's writeable flag can also be set again, since its base is
+    writable. Elements of object arrays (e.g., nested arrays) are not made read-only.
+    """
+    view = np.asarray(values).view()
+    view.flags.writeable = False
+    return view
+
+
+def is_numeric_data_set(values):
+    if isinstance(values, array.array):
+        return values.typecode in "dq"
+    if isinstance(values, np.ndarray):
+        return values.dtype.kind in "fiu"
+    return all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)
+
+
+class PerformanceMap:
+    """
+    Interpolator for a performance map of a representation (e.g., lineage ["performance",
+    "performance_map_cooling"]). Non-numeric lookup variables (e.g., 'operation_state') are not
+    interpolated.
+    """
+
+    def __init__(self, schema, representation, lineage):
+        grid_variables = get_representation_node(representation, lineage + ["grid_variables"])
+        lookup_variables = get_representation_node(representation, lineage + ["lookup_variables"])
+        self.grid_variable_names = schema.get_grid_variable_order(
+            lineage + ["grid_variables"], list(grid_variables)
+        )
+        self.lookup_variable_names = [
+            name for name, values in lookup_variables.items() if is_numeric_data_set(values)
+        ]
+        self.interpolator = RegularGridInterpolator(
+            [grid_variables[name] for name in self.grid_variable_names],
+            [lookup_variables[name] for name in self.lookup_variable_names],
+        )
+
+    def __call__(self, targets, methods=LINEAR):
+        """
+        Return the lookup variables (N, n_lookup) at the targets (N, ndim), with the grid variables of
+        each target in the order of grid_variable_names. See RegularGridInterpolator for methods.
+        """
+        return self.interpolator(targets, methods)
+
+    def calculate_performance(self, target, methods=LINEAR):
+        """
+        Return a dictionary of lookup variable values at a single target (a sequence of grid variable
+        values, or a dictionary keyed by grid variable name).
+        """
+        if isinstance(target, dict):
+            target = [target[name] for name in self.grid_variable_names]
+        return dict(zip(self.lookup_variable_names, self.interpolator([target], methods)[0].tolist()))
+
+    def query(self, methods=LINEAR):
+        """
+        Return a SequentialQuery of this map for use by one thread. Targets are sequences of grid
+        variable values in the order of grid_variable_names.
+        """
+        return SequentialQuery(self.interpolator, methods)
+
+    def view(self):
+        """
+        Return a MapView of the lookup variables. Its arrays are views of the interpolator's table,
+        which is not copied.
+        """
+        table = self.interpolator.table.reshape(self.interpolator.shape + (-1,))
+        return MapView(
+            dict(zip(self.grid_variable_names, self.interpolator.axes)),
+            {name: table[..., i] for i, name in enumerate(self.lookup_variable_names)},
+        )
@@ -3,6 +3,8 @@ import yaml
 import os
 from collections import OrderedDict
 import re
+from schema205.file_io import load_source
+from schema205.util import run_in_pool
 
 
 def get_extension(file):
@@ -406,7 +408,7 @@ class JSON_translator:
         self._source_dir = os.path.dirname(os.path.abspath(input_file_path))
         self._schema_name = os.path.splitext(os.path.splitext(os.path.basename(input_file_path))[0])[0]
         self._fundamental_data_types.clear()
-        self._contents = load(input_file_path)
+        self._contents = load_source(input_file_path)
         sch = dict()
         # Iterate through the dictionary, looking for known types
         for base_level_tag in self._contents:
@@ -467,7 +469,7 @@ class JSON_translator:
         if "References" in schema_section:
             refs += schema_section["References"]
         for ref_file in refs:
-            ext_dict = load(os.path.join(self._source_dir, ref_file + ".schema.yaml"))
+            ext_dict = load_source(os.path.join(self._source_dir, ref_file + ".schema.yaml"))
             external_objects = list()
             for base_item in [
                 name
@@ -532,16 +534,29 @@ def translate_file(input_file_path, output_file_path):
     dump(schema_instance, output_file_path)
 
 
-def translate_dir(input_dir_path, output_dir_path):
-    j = JSON_translator()
+def _translate_file(translator, arguments):
+    input_file_path, output_file_path = arguments
+    dump(translator.load_common_schema(input_file_path), output_file_path)
+
+
+def translate_dir(input_dir_path, output_dir_path, jobs=1):
+    """
+    Translate every schema source in input_dir_path to JSON schema in output_dir_path.
+
+    :param jobs:    Number of worker processes. If None, use the number of available CPUs. Outputs
+                    are identical for any number of jobs.
+    """
+    tasks = []
     for file_name in sorted(os.listdir(input_dir_path)):
         if ".schema.yaml" in file_name:
             file_name_root = os.path.splitext(os.path.splitext(file_name)[0])[0]
-            schema_instance = j.load_common_schema(os.path.join(input_dir_path, file_name))
-            dump(
-                schema_instance,
-                os.path.join(output_dir_path, file_name_root + ".schema.json"),
+            tasks.append(
+                (
+                    os.path.join(input_dir_path, file_name),
+                    os.path.join(output_dir_path, file_name_root + ".schema.json"),
+                )
             )
+    run_in_pool(_translate_file, tasks, jobs, JSON_translator)
 
 
 if __name__ == "__main__":
@@ -6,8 +6,8 @@ import os
 import sys
 import io
 
-import yaml
-
+from schema205.file_io import load_source
+from schema205.util import run_in_pool
 import schema205.md.schema_table as schema_table
 
 
@@ -87,20 +87,33 @@ def write_tables(instance, output_path, append=True):
 
 
 def write_file(input_path, output_path):
-    with open(input_path, "r") as input_file:
-        instance = yaml.load(input_file, Loader=yaml.FullLoader)
+    instance = load_source(input_path)
     write_tables(instance, output_path, append=False)
     print(f"Markdown generation successful for {input_path}")
 
 
-def write_dir(input_dir_path, output_dir_path):
-    for file_name in sorted(os.listdir(input_dir_path)):
-        if ".schema.yaml" in file_name:
-            file_name_root = os.path.splitext(os.path.splitext(file_name)[0])[0]
-            with open(os.path.join(input_dir_path, file_name), "r") as input_file:
-                instance = yaml.load(input_file, Loader=yaml.FullLoader)
-            write_tables(instance, os.path.join(output_dir_path, f"{file_name_root}.schema.md"), append=False)
-            print(f"Markdown generation successful for {file_name}")
+def _write_file(_, arguments):
+    input_file_path, output_file_path = arguments
+    write_tables(load_source(input_file_path), output_file_path, append=False)
+
+
+def write_dir(input_dir_path, output_dir_path, jobs=1):
+    """
+    Write the Markdown tables of every schema source in input_dir_path to output_dir_path.
+
+    :param jobs:    Number of worker processes. If None, use the number of available CPUs. Outputs
+                    (and messages) are identical for any number of jobs.
+    """
+    file_names = [file_name for file_name in sorted(os.listdir(input_dir_path)) if ".schema.yaml" in file_name]
+    tasks = []
+    for file_name in file_names:
+        file_name_root = os.path.splitext(os.path.splitext(file_name)[0])[0]
+        tasks.append(
+            (os.path.join(input_dir_path, file_name), os.path.join(output_dir_path, f"{file_name_root}.schema.md"))
+        )
+    run_in_pool(_write_file, tasks, jobs)
+    for file_name in file_names:
+        print(f"Markdown generation successful for {file_name}")
 
 
 if __name__ == "__main__":
@@ -135,17 +135,17 @@ def load_structure_from_object(instance):
     for obj in instance:
         object_type = instance[obj]["Object Type"]
         if object_type == "Data Type":
-            new_obj = instance[obj]
+            new_obj = dict(instance[obj])
             new_obj["Data Type"] = f"`{obj}`"
             new_obj["Examples"] = ", ".join(new_obj["Examples"])
             data_types.append(new_obj)
         elif object_type == "String Type":
-            new_obj = instance[obj]
+            new_obj = dict(instance[obj])
             new_obj["String Type"] = f"`{obj}`"
             new_obj["Examples"] = ", ".join(new_obj["Examples"])
             string_types.append(new_obj)
         elif object_type == "Enumeration":
-            new_obj = instance[obj]
+            new_obj = dict(instance[obj])
             compress_notes(new_obj)
             enumerations[obj] = new_obj
         elif "Data Elements" in instance[obj]:
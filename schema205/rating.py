@@ -0,0 +1,183 @@
+"""
+Part-load ratings (AHRI 550/590 integrated part-load value, IPLV) of a corpus of chillers (RS0001).
+
+Representations are parsed (in parallel, and cached between runs) into RatingMaps holding only what
+the ratings need. Chillers sharing the same performance map grid are then rated together: the
+rating points of every compressor stage are interpolated for all of them in a single call.
+"""
+import csv
+import hashlib
+import os
+
+import numpy as np
+from .file_io import load_json, read_cache_entry, write_cache_entry
+from .interpolate import RegularGridInterpolator, LINEAR
+from .schema import SchemaRegistry
+from .simulate import STAGE, stage_operation
+from .util import run_in_pool
+
+EVAPORATOR_TEMPERATURE = "evaporator_liquid_leaving_temperature"
+CONDENSER_TEMPERATURES = {
+    "AIR": "condenser_air_entering_drybulb_temperature",
+    "LIQUID": "condenser_liquid_entering_temperature",
+}
+
+# Rating points: load fraction, IPLV weight and entering condenser temperature (K) by condenser type
+RATING_POINTS = [
+    (1.00, 0.01, {"AIR": 308.15, "LIQUID": 302.59}),
+    (0.75, 0.42, {"AIR": 299.82, "LIQUID": 297.04}),
+    (0.50, 0.45, {"AIR": 291.48, "LIQUID": 291.48}),
+    (0.25, 0.12, {"AIR": 285.93, "LIQUID": 291.48}),
+]
+LEAVING_CHILLED_WATER_TEMPERATURE = 279.82  # K (44 F)
+
+COLUMNS = ["file", "condenser_type", "capacity", "cop_100", "cop_75", "cop_50", "cop_25", "iplv"]
+
+CACHE_VERSION = 1
+
+
+class RatingMap:
+    """
+    The parts of an RS0001 representation needed for its ratings: the grid of its cooling performance
+    map (in schema order), its capacity and power data sets and its cycling degradation coefficient.
+    """
+
+    def __init__(self, schema, representation):
+        performance = representation["performance"]
+        lineage = ["performance", "performance_map_cooling", "grid_variables"]
+        performance_map = performance["performance_map_cooling"]
+        grid_variables = performance_map["grid_variables"]
+        self.condenser_type = performance["condenser_type"]
+        self.grid_variable_names = schema.get_grid_variable_order(lineage, list(grid_variables))
+        self.axes = [tuple(grid_variables[name]) for name in self.grid_variable_names]
+        self.capacity = np.asarray(performance_map["lookup_variables"]["net_evaporator_capacity"], dtype=float)
+        self.power = np.asarray(performance_map["lookup_variables"]["input_power"], dtype=float)
+        self.cycling_degradation_coefficient = performance["cycling_degradation_coefficient"]
+
+    def grid_key(self):
+        """
+        Return a key shared by maps that can be interpolated together. Single-value axes are not
+        compared: values along them are the same wherever they are evaluated.
+        """
+        return (
+            self.condenser_type,
+            tuple(self.grid_variable_names),
+            tuple(axis if len(axis) > 1 else None for axis in self.axes),
+        )
+
+    def get_targets(self):
+        """
+        Return the targets (rating points, stages, ndim) of the rating points for every compressor stage.
+        Grid variables other than the temperatures are set to the highest value of their axis.
+        """
+        targets = np.empty((len(RATING_POINTS), len(self.stages()), len(self.axes)))
+        for i, (name, axis) in enumerate(zip(self.grid_variable_names, self.axes)):
+            if name == STAGE:
+                targets[:, :, i] = self.stages()
+            elif name == EVAPORATOR_TEMPERATURE:
+                targets[:, :, i] = LEAVING_CHILLED_WATER_TEMPERATURE
+            elif name == CONDENSER_TEMPERATURES.get(self.condenser_type):
+                targets[:, :, i] = [[point[2][self.condenser_type]] for point in RATING_POINTS]
+            else:
+                targets[:, :, i] = max(axis)
+        return targets
+
+    def stages(self):
+        return np.asarray(self.axes[self.grid_variable_names.index(STAGE)], dtype=float)
+
+
+def cache_path(cache_dir, path):
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pickle")
+
+
+def load_rating_map(path, registry, cache_dir=None):
+    """
+    Return the RatingMap of the representation at path. If cache_dir is given, the map is read from
+    (or written to) a cache entry that is reused as long as the file's size and modification time
+    are unchanged. Entries are only read from (and written to) a directory private to the current
+    user (see file_io.read_cache_entry).
+    """
+    stat = os.stat(path)
+    key = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    if cache_dir is not None:
+        entry_path = cache_path(cache_dir, path)
+        entry = read_cache_entry(entry_path)
+        if entry is not None and entry[0] == key:
+            return entry[1]  # Other entries (e.g., written by another version of RatingMap) are replaced
+    representation = load_json(path)
+    if representation["metadata"]["schema"] != "RS0001":
+        raise Exception(f"'{path}' is not an RS0001 representation.")
+    rating_map = RatingMap(registry.get_for_instance(representation), representation)
+    if cache_dir is not None:
+        write_cache_entry(entry_path, key, rating_map)
+    return rating_map
+
+
+def rate(rating_maps):
+    """
+    Return the ratings of RatingMaps sharing the same grid key as a dictionary of arrays (one value per
+    map): full-load capacity (W), COP at each rating point and IPLV.
+    """
+    first = rating_maps[0]
+    n_maps, n_points, n_stages = len(rating_maps), len(RATING_POINTS), len(first.stages())
+    data_sets = [data_set for rating_map in rating_maps for data_set in (rating_map.capacity, rating_map.power)]
+    interpolator = RegularGridInterpolator(first.axes, data_sets)
+    targets = first.get_targets()
+
+    # (points * stages, maps * 2) -> (maps * points, stages) for capacity and power
+    results = interpolator(targets.reshape(-1, len(first.axes)), LINEAR)
+    results = results.reshape(n_points, n_stages, n_maps, 2).transpose(2, 0, 1, 3).reshape(-1, n_stages, 2)
+    capacities, powers = results[:, :, 0], results[:, :, 1]
+
+    full_load_capacity = capacities[::n_points, -1]
+    fractions = np.array([point[0] for point in RATING_POINTS])
+    load = (full_load_capacity[:, np.newaxis] * fractions).ravel()
+    cycling_degradation_coefficients = np.repeat(
+        [rating_map.cycling_degradation_coefficient for rating_map in rating_maps], n_points
+    )
+    operation = stage_operation(first.stages(), capacities, powers, load, cycling_degradation_coefficients)
+    cop = (operation["capacity"] / operation["power"]).reshape(n_maps, n_points)
+
+    ratings = {"capacity": full_load_capacity}
+    for i, (fraction, _, _) in enumerate(RATING_POINTS):
+        ratings[f"cop_{round(fraction * 100)}"] = cop[:, i]
+    ratings["iplv"] = cop @ np.array([point[1] for point in RATING_POINTS])
+    return ratings
+
+
+def _load_rating_map(registry, arguments):
+    path, cache_dir = arguments
+    return load_rating_map(path, registry, cache_dir)
+
+
+def rate_files(paths, schema_dir, jobs=1, cache_dir=None):
+    """
+    Return the ratings of the RS0001 representations at paths as a list of rows (dictionaries of the
+    COLUMNS), in the order of paths.
+
+    :param jobs:        Number of worker processes parsing representations. If None, use the number
+                        of available CPUs.
+    :param cache_dir:   Directory of parsed maps reused between runs (see load_rating_map)
+    """
+    rating_maps = run_in_pool(
+        _load_rating_map, [(path, cache_dir) for path in paths], jobs, SchemaRegistry, (schema_dir,)
+    )
+
+    groups = {}
+    for i, rating_map in enumerate(rating_maps):
+        groups.setdefault(rating_map.grid_key(), []).append(i)
+    rows = [None] * len(paths)
+    for indices in groups.values():
+        ratings = rate([rating_maps[i] for i in indices])
+        for j, i in enumerate(indices):
+            rows[i] = {"file": os.path.basename(paths[i]), "condenser_type": rating_maps[i].condenser_type}
+            rows[i].update({name: float(values[j]) for name, values in ratings.items()})
+    return rows
+
+
+def write_ratings(rows, output_path):
+    with open(output_path, "w", newline="") as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
@@ -10,6 +10,7 @@ import traceback
 from jinja2 import Environment, FileSystemLoader, select_autoescape, TemplateNotFound
 import yaml
 
+from schema205.file_io import load_source
 import schema205.md.schema_table as schema_table
 import schema205.md.grid_table as grid_table
 import schema205.markdown as markdown
@@ -143,9 +144,7 @@ def load_yaml_source(schema_dir, source, args_str):
             make_error_string(f'Schema source "{source}" ("{src_path}") doesn\'t exist!', args_str),
             None,
         )
-    with open(src_path, encoding="utf-8", mode="r") as input_file:
-        data = yaml.load(input_file, Loader=yaml.FullLoader)
-    return (None, data)
+    return (None, load_source(src_path))
 
 
 def make_add_schema_table(schema_dir=None, error_log=None):
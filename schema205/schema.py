@@ -1,10 +1,21 @@
 import os
+import io
+import sys
+import array
 import json
-import posixpath
+import contextlib
+import itertools
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
 import jsonschema
+import numpy as np
 from .util import create_grid_set
 from .util import get_representation_node
+from .util import run_in_pool
 from .file_io import load_json
+from .file_io import JSONStream
+from .bundle import bundle_schema, split_ref, localize_ref
 
 
 def iterdict(d, dict_as_list, level=0):
@@ -17,18 +28,234 @@ def iterdict(d, dict_as_list, level=0):
             dict_as_list.append(preamble + ": " + str(d[key]))
 
 
-class A205Schema:
-    def __init__(self, schema_path):
-        with open(schema_path, "r") as schema_file:
-            uri_path = os.path.abspath(os.path.dirname(schema_path))
-            if os.sep != posixpath.sep:
-                uri_path = posixpath.sep + uri_path
+NUMERIC_ITEM_KEYWORDS = {"type", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"}
+NUMERIC_ITEM_TYPES = {"number": {int, float}, "integer": {int}}
+ARRAY_TYPECODES = {"number": "d", "integer": "q"}
+# Typecodes (array.array) and dtype kinds (numpy.ndarray) whose every element is a valid item
+BUFFER_ITEM_TYPES = {"number": {"d", "q", "f", "i", "u"}, "integer": {"q", "i", "u"}}
+ANNOTATION_KEYWORDS = {
+    "title",
+    "description",
+    "units",
+    "notes",
+    "enum_text",
+    "descriptions",
+    "scalable",
+    "requiredText",
+    "constraintsText",
+}
 
-            resolver = jsonschema.RefResolver(f"file://{uri_path}/", schema_path)
 
-            self.validator = jsonschema.Draft7Validator(
-                json.load(schema_file), resolver=resolver
-            )
+def is_numeric_array_schema(items):
+    """
+    Return True if an 'items' schema describes plain numbers (e.g., '[Numeric][1..]' Grid Variables
+    and Lookup Variables), optionally with bounds.
+    """
+    return (
+        isinstance(items, dict)
+        and items.get("type") in NUMERIC_ITEM_TYPES
+        and NUMERIC_ITEM_KEYWORDS.issuperset(items)
+    )
+
+
+def is_enumeration_array_schema(items):
+    """
+    Return True if a (resolved) 'items' schema describes plain enumerators (e.g., the
+    '[<OperationState>]' Lookup Variables).
+    """
+    return (
+        isinstance(items, dict)
+        and items.get("type") == "string"
+        and "enum" in items
+        and {"type", "enum"}.union(ANNOTATION_KEYWORDS).issuperset(items)
+    )
+
+
+def numeric_array_is_valid(items, instance):
+    """
+    Check the type and bounds of every element of a numeric array at once.
+
+    Returns True only if all elements are valid. A False result is not conclusive (e.g., integral
+    floats are valid 'integer' items); the caller falls back to element-by-element validation, which
+    also produces the error messages.
+    """
+    if isinstance(instance, array.array):
+        if instance.typecode not in BUFFER_ITEM_TYPES[items["type"]]:
+            return False
+    elif isinstance(instance, np.ndarray):
+        if instance.ndim != 1 or instance.dtype.kind not in BUFFER_ITEM_TYPES[items["type"]]:
+            return False
+    elif type(instance) not in (list, tuple):
+        return False
+    elif not set(map(type, instance)).issubset(NUMERIC_ITEM_TYPES[items["type"]]):
+        return False
+    if len(items) == 1 or len(instance) == 0:
+        return True
+    values = np.asarray(instance, dtype=float)
+    valid = True
+    if "minimum" in items:
+        valid &= bool((values >= items["minimum"]).all())
+    if "maximum" in items:
+        valid &= bool((values <= items["maximum"]).all())
+    if "exclusiveMinimum" in items:
+        valid &= bool((values > items["exclusiveMinimum"]).all())
+    if "exclusiveMaximum" in items:
+        valid &= bool((values < items["exclusiveMaximum"]).all())
+    return valid
+
+
+def enumeration_array_is_valid(items, instance):
+    """Check that every element of an array is one of the enumerators, using set operations."""
+    return (
+        type(instance) in (list, tuple)
+        and set(map(type, instance)).issubset({str})
+        and set(instance).issubset(items["enum"])
+    )
+
+
+def read_only(node):
+    """Return a read-only view of a schema object (other schema values are returned as they are)."""
+    return MappingProxyType(node) if isinstance(node, dict) else node
+
+
+def ref_resolver(validator):
+    """
+    RefResolver of a validator. The public 'resolver' attribute emits a DeprecationWarning on every
+    access, which is too noisy for keyword implementations called once per array.
+    """
+    return validator._ref_resolver
+
+
+def homogeneous_items(validator, items, instance, schema):
+    """
+    'items' keyword with a fast path for homogeneous numeric and enumerator arrays. Any array that
+    fails the fast path is validated by the standard Draft 7 implementation, so errors are unchanged.
+    """
+    if isinstance(items, dict) and "$ref" in items and type(instance) in (list, tuple):
+        resolved = ref_resolver(validator).resolve(items["$ref"])[1]
+        if is_enumeration_array_schema(resolved) and enumeration_array_is_valid(resolved, instance):
+            return
+    elif is_numeric_array_schema(items) and numeric_array_is_valid(items, instance):
+        return
+    yield from jsonschema.Draft7Validator.VALIDATORS["items"](validator, items, instance, schema)
+
+
+def lazy_ref(validator, ref, instance, schema):
+    """
+    '$ref' keyword that yields errors as they are found. The Draft 7 implementation (with a
+    RefResolver) collects every error below a reference before yielding the first one, which defeats
+    stopping validation early.
+    """
+    resolver = ref_resolver(validator)
+    scope, resolved = resolver.resolve(ref)
+    resolver.push_scope(scope)
+    try:
+        yield from validator.descend(instance, resolved)
+    finally:
+        resolver.pop_scope()
+
+
+def is_array(checker, instance):
+    return isinstance(instance, (list, tuple, array.array, np.ndarray))
+
+
+def is_object(checker, instance):
+    return isinstance(instance, Mapping)
+
+
+A205Validator = jsonschema.validators.extend(
+    jsonschema.Draft7Validator,
+    {"items": homogeneous_items, "$ref": lazy_ref},
+    # Also accept compact representations (see A205Schema.compact)
+    type_checker=jsonschema.Draft7Validator.TYPE_CHECKER.redefine_many(
+        {"array": is_array, "object": is_object}
+    ),
+)
+
+
+def compact_array(values, typecode):
+    """
+    Return values as an array.array of the typecode, or None if any value is not of the array's type
+    (such arrays are left for validation to report).
+    """
+    if not set(map(type, values)).issubset(NUMERIC_ITEM_TYPES["integer" if typecode == "q" else "number"]):
+        return None
+    try:
+        return array.array(typecode, values)
+    except OverflowError:
+        return None
+
+
+class _StreamedObject:
+    """
+    Skeleton of a JSON object read by A205Schema.validate_stream.
+
+    Data groups are either entered recursively (children) or deferred, to be parsed and validated
+    one at a time.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.skeleton = {}
+        self.children = {}
+        self.deferred = set()
+        self.subschemas = {}
+
+    def find(self, lineage):
+        node = self
+        for key in lineage:
+            node = node.children[key]
+        return node
+
+    def is_conditional(self, key):
+        return any(key in option.get("then", {}).get("properties", {}) for option in self.schema.get("allOf", []))
+
+    def relaxed_schema(self):
+        """
+        Copy of this object's schema in which the schemas of entered and deferred data groups are
+        replaced by empty (always valid) schemas. Requirements and dependencies are unaffected.
+        """
+        placeholders = set(self.children) | self.deferred
+
+        def relax(schema):
+            if "properties" not in schema:
+                return schema
+            properties = {
+                key: ({} if key in placeholders else value) for key, value in schema["properties"].items()
+            }
+            return {**schema, "properties": properties}
+
+        relaxed = relax(self.schema)
+        if "allOf" in relaxed:
+            relaxed["allOf"] = [
+                {key: (relax(value) if key in ["then", "else"] else value) for key, value in option.items()}
+                if "if" in option
+                else relax(option)
+                for option in relaxed["allOf"]
+            ]
+        return relaxed
+
+
+class A205Schema:
+    def __init__(self, schema_path, bundle=None):
+        """
+        :param schema_path: Path to a *.schema.json file
+        :param bundle:      The self-contained schema created by bundle_schema(schema_path), if already
+                            available. Otherwise, it is created from schema_path.
+
+        Validation only uses the bundle; no files or URIs are resolved while validating.
+        """
+        self.file_name = os.path.basename(schema_path)
+        self.schema_dir = os.path.dirname(schema_path)
+        if bundle is None:
+            bundle = bundle_schema(schema_path)
+        resolver = jsonschema.RefResolver.from_schema(bundle)
+        self.validator = A205Validator(bundle, resolver=resolver)
+        self._lineage_index = None
+        self._grid_variable_orders = None
+        self._array_typecodes = None
+        self._resolutions = {}  # (id(node), step_in) -> (node, resolution)
+        self._resolved_refs = {}  # ref -> resolution
 
     def process_errors(self, errors, parent_level=0):
         """
@@ -37,7 +264,6 @@ class A205Schema:
         messages = []
         for error in errors:
             if error.validator in ["oneOf", "anyOf", "allOf"]:
-                schema_node = self.get_schema_node(list(error.absolute_path))
                 rs_errors = error.context
                 messages += self.process_errors(rs_errors, len(error.path))
             else:
@@ -52,47 +278,204 @@ class A205Schema:
                 )
         return messages
 
-    def validate(self, instance):
-        errors = sorted(self.validator.iter_errors(instance), key=lambda e: e.path)
+    def validate(self, instance, max_errors=None):
+        """
+        Raise an exception listing the validation errors of the instance, if any.
+
+        :param max_errors:  If given, stop after finding this many errors. Errors are then reported
+                            in the order they were found instead of being sorted by path.
+        """
+        if max_errors is None:
+            errors = sorted(self.validator.iter_errors(instance), key=lambda e: e.path)
+        else:
+            errors = list(itertools.islice(self.validator.iter_errors(instance), max_errors))
         if len(errors) == 0:
             print(f"Validation successful for {instance['metadata']['description']}")
         else:
             messages = self.process_errors(errors)
-            messages = [
-                f"{i}. {message}" for i, message in enumerate(messages, start=1)
-            ]
-            message_str = "\n  ".join(messages)
-            raise Exception(
-                f'Validation failed for "{instance["metadata"]["description"]}" ({instance["metadata"]["schema"]}) with {len(messages)} errors:\n  {message_str}'
-            )
+            truncated = max_errors is not None and len(errors) == max_errors
+            if truncated:
+                messages = messages[:max_errors]
+            self.raise_validation_errors(instance["metadata"], messages, truncated)
+
+    def is_valid(self, instance):
+        """Return whether the instance is valid, stopping at the first error."""
+        return self.validator.is_valid(instance)
+
+    def raise_validation_errors(self, metadata, messages, truncated=False):
+        count = f"at least {len(messages)}" if truncated else f"{len(messages)}"
+        messages = [f"{i}. {message}" for i, message in enumerate(messages, start=1)]
+        message_str = "\n  ".join(messages)
+        raise Exception(
+            f'Validation failed for "{metadata["description"]}" ({metadata["schema"]}) with {count} errors:\n  {message_str}'
+        )
+
+    def validate_stream(self, file_path, chunk_size=65536):
+        """
+        Validate a representation file without loading it into memory all at once.
+
+        The file is read twice. The first pass collects a skeleton of the representation, where
+        every data group (except 'performance' and nested representations, which are entered
+        recursively) is replaced by a placeholder. The skeleton is validated to check requirements,
+        selectors, and simple data elements, and to determine which subschemas apply to each data
+        group. The second pass parses each data group (e.g., 'metadata', 'description', each
+        'performance_map_*'), validates it, and then drops it, so peak memory is bounded by the
+        largest single data group (its text as well as its parsed content).
+
+        This only saves memory when no single data group holds most of the file, and it takes several
+        times longer than validate. Most representations hold nearly all of their data in one
+        performance map (e.g., the HPDM example peaks at the same memory either way), so use
+        validate unless a file is too large to load; benchmarks/stream_validation.py compares both
+        (a heat pump with cooling, heating and defrost maps of similar size peaks about 15% lower).
+        """
+        with open(file_path, "r") as input_file:
+            root = self._read_skeleton(JSONStream(input_file, chunk_size), self.validator.schema)
+        errors = []
+        self._validate_skeleton(root, [], errors)
+        metadata = {"description": None, "schema": None}
+        with open(file_path, "r") as input_file:
+            stream = JSONStream(input_file, chunk_size)
+            for lineage, group in self._iter_data_groups(stream, root, []):
+                if lineage == ["metadata"] and isinstance(group, dict):
+                    metadata = {**metadata, **group}
+                for schema in root.find(lineage[:-1]).subschemas[lineage[-1]]:
+                    self._collect_errors(group, schema, lineage, errors)
+                del group
+        if len(errors) == 0:
+            print(f"Validation successful for {metadata['description']}")
+        else:
+            errors = sorted(errors, key=lambda e: e.path)
+            self.raise_validation_errors(metadata, self.process_errors(errors))
+
+    def _resolve_object_schema(self, node):
+        """Follow $ref chains without modifying the schema (siblings of $ref are annotations)."""
+        while isinstance(node, dict) and "$ref" in node:
+            node = ref_resolver(self.validator).resolve(node["$ref"])[1]
+        return node
+
+    def _is_stream_container(self, key, member_schema):
+        """
+        Data groups that are entered rather than treated as a unit when streaming: the 'performance'
+        group and nested representations (references to the root data group of another schema).
+        """
+        if key == "performance":
+            return True
+        if isinstance(member_schema, dict) and "$ref" in member_schema:
+            file_name, pointer = split_ref(member_schema["$ref"], self.file_name)
+            return pointer == f"/definitions/{file_name.split('.')[0]}"
+        return False
+
+    def _read_skeleton(self, stream, schema):
+        node = _StreamedObject(self._resolve_object_schema(schema))
+        properties = node.schema.get("properties", {}) if isinstance(node.schema, dict) else {}
+        for key in stream.iter_object():
+            if stream.peek() != "{":
+                node.skeleton[key] = stream.read_value()
+            elif (
+                key in properties
+                and self._is_stream_container(key, properties[key])
+                and not node.is_conditional(key)
+            ):
+                node.children[key] = self._read_skeleton(stream, properties[key])
+                node.skeleton[key] = {}
+            else:
+                stream.skip_value()
+                node.deferred.add(key)
+                node.skeleton[key] = {}
+        return node
+
+    def _validate_skeleton(self, node, lineage, errors):
+        """Validate a skeleton and decide which subschemas apply to each deferred data group."""
+        self._collect_errors(node.skeleton, node.relaxed_schema(), lineage, errors)
+        validator = self.validator.evolve(schema=node.schema)
+        for key in node.deferred:
+            node.subschemas[key] = []
+            if key in node.schema.get("properties", {}):
+                node.subschemas[key].append(node.schema["properties"][key])
+            for option in node.schema.get("allOf", []):
+                branch = option
+                if "if" in option:
+                    if validator.evolve(schema=option["if"]).is_valid(node.skeleton):
+                        branch = option.get("then", {})
+                    else:
+                        branch = option.get("else", {})
+                if key in branch.get("properties", {}):
+                    node.subschemas[key].append(branch["properties"][key])
+        for key, child in node.children.items():
+            self._validate_skeleton(child, lineage + [key], errors)
+
+    def _iter_data_groups(self, stream, node, lineage):
+        for key in stream.iter_object():
+            if key in node.children:
+                yield from self._iter_data_groups(stream, node.children[key], lineage + [key])
+            elif key in node.deferred:
+                yield lineage + [key], stream.read_value()
+            else:
+                stream.skip_value()
+
+    def _collect_errors(self, instance, schema, lineage, errors):
+        """
+        Collect errors with paths relative to the root of the representation. Errors do not keep
+        references to the (possibly large) instance data they were raised for.
+        """
+
+        def detach(error):
+            error.instance = None
+            for child in error.context:
+                detach(child)
+            return error
+
+        for error in self.validator.evolve(schema=schema).iter_errors(instance):
+            error.path.extendleft(reversed(lineage))
+            errors.append(detach(error))
 
     def resolve(self, node, step_in=True, parent_node=None):
         """
         Return this node with any references replaced by entire referenced object.
         If step_in is True, return the node's properties instead.
+
+        Neither the node nor the schema is modified: a reference with sibling keywords resolves to a
+        merged copy. Results are cached, read-only views.
         """
-        if isinstance(node, dict) and "if" in node:
+        key = (id(node), step_in)
+        if key not in self._resolutions:
+            # Keep the node so that its id is not reused
+            self._resolutions[key] = (node, self._resolve(node, step_in))
+        return self._resolutions[key][1]
+
+    def _resolve(self, node, step_in):
+        if isinstance(node, Mapping) and "if" in node:
             node = node["then"]
-            resolution = node
 
         if "$ref" in node:
             resolution = self.resolve_ref(node["$ref"])
             # Carry other contents from location of reference
-            for item in node:
-                if item != "$ref":
-                    resolution[item] = node[item]
+            siblings = {item: node[item] for item in node if item != "$ref"}
+            if siblings:
+                resolution = MappingProxyType({**resolution, **siblings})
         else:
-            resolution = node
+            resolution = read_only(node)
 
         if step_in and "properties" in resolution:
-            return resolution["properties"]
+            return read_only(resolution["properties"])
         else:
             return resolution
 
     def resolve_ref(self, ref):
-        scope, resolution = self.validator.resolver.resolve(ref)
-        self.validator.resolver.push_scope(scope)
-        return resolution
+        """
+        Resolve a reference into this schema or, by file name, into any schema it references. Other
+        schema files are read from the directory of this schema. Results are cached, read-only views.
+        """
+        if ref not in self._resolved_refs:
+            file_name, pointer = split_ref(ref, self.file_name)
+            if file_name != self.file_name and file_name not in self.get_schema().get("definitions", {}):
+                document = load_json(os.path.join(self.schema_dir, file_name))
+            else:
+                document = self.get_schema()
+                pointer = localize_ref(ref, self.file_name)[1:]
+            resolution = ref_resolver(self.validator).resolve_fragment(document, pointer)
+            self._resolved_refs[ref] = read_only(resolution)
+        return self._resolved_refs[ref]
 
     def get_schema(self):
         return self.validator.schema
@@ -161,15 +544,119 @@ class A205Schema:
         raise KeyError(f"'{lineage[0]}' not found in schema.")
 
     def get_schema_node(self, lineage, options=None):
-        if len(lineage) == 0:
-            return self.resolve(self.validator.schema, step_in=False)
+        """
+        Return the schema node for a lineage (list of data element names from the root).
+
+        options: indices of the 'allOf' alternatives (e.g., alternative performance maps) to use for
+        each generation of the lineage, or None to use the first match
+        """
         if options is None:
             options = [None] * len(lineage)
+        node = self.get_lineage_index().get((tuple(lineage), tuple(options)))
+        if node is None:
+            node = self.trace_schema_node(lineage, options)
+        return node
+
+    def trace_schema_node(self, lineage, options):
+        """
+        Search the schema for the node of a lineage (see get_schema_node) without using the lineage index.
+        """
+        if len(lineage) == 0:
+            return self.resolve(self.validator.schema, step_in=False)
         schema = self.resolve(self.validator.schema)
         return self.trace_lineage(
             schema, lineage, options, self.resolve(self.validator.schema, False)
         )
 
+    def get_lineage_index(self):
+        """
+        Return a dictionary of schema nodes keyed by (lineage, options) tuples, covering every data
+        element of the schema. The index is built on first use.
+        """
+        if self._lineage_index is None:
+            index = {}
+            root = self.trace_schema_node([], [])
+            for lineage, options in self._iter_lineage_keys(root, (), ()):
+                if (lineage, options) not in index:
+                    try:
+                        index[(lineage, options)] = self.trace_schema_node(list(lineage), list(options))
+                    except KeyError:
+                        pass
+            index[((), ())] = root
+            self._lineage_index = index
+        return self._lineage_index
+
+    def _iter_lineage_keys(self, node, lineage, options):
+        """
+        Yield candidate (lineage, options) keys for the data elements below a (resolved, not stepped
+        into) schema node. Members defined in 'allOf' alternatives are yielded both with their option
+        index and with None.
+        """
+        members = [(key, None, member) for key, member in node.get("properties", {}).items()]
+        for i, option in enumerate(node.get("allOf", [])):
+            resolution = self.resolve(option, False)
+            for key, member in resolution.get("properties", {}).items():
+                members.append((key, i, member))
+        for key, option_index, member in members:
+            child = self.resolve(member, False)
+            if isinstance(child, Mapping) and "items" in child:
+                child = self.resolve(child["items"], False)
+            for option in {None, option_index}:
+                yield lineage + (key,), options + (option,)
+                if isinstance(child, Mapping):
+                    yield from self._iter_lineage_keys(child, lineage + (key,), options + (option,))
+
+    def iter_lineages(self):
+        """
+        Yield (lineage, options, node) for every entry of the lineage index, parents before children.
+        """
+        entries = sorted(self.get_lineage_index().items(), key=lambda entry: len(entry[0][0]))
+        for (lineage, options), node in entries:
+            yield lineage, options, node
+
+    def get_array_typecodes(self):
+        """
+        Return a dictionary of array.array typecodes ('d' for numbers, 'q' for integers) keyed by the
+        lineage (tuple) of every numeric array data element (e.g., grid and lookup variables).
+        """
+        if self._array_typecodes is None:
+            typecodes = {}
+            for lineage, options, node in self.iter_lineages():
+                if any(option is not None for option in options) or not isinstance(node, Mapping):
+                    continue
+                if node.get("type") == "array" and is_numeric_array_schema(node.get("items")):
+                    typecodes[lineage] = ARRAY_TYPECODES[node["items"]["type"]]
+            self._array_typecodes = typecodes
+        return self._array_typecodes
+
+    def compact(self, instance):
+        """
+        Return a read-only copy of an instance (e.g., from load_json) that takes much less memory:
+        numeric arrays become array.array buffers ('d' or 'q'), other arrays become tuples, objects
+        become read-only mappings and strings are interned. The copy can be validated and interpolated like the instance.
+        """
+        typecodes = self.get_array_typecodes()
+
+        def convert(node, lineage):
+            if isinstance(node, dict):
+                return MappingProxyType({key: convert(value, lineage + (key,)) for key, value in node.items()})
+            if isinstance(node, list):
+                if lineage in typecodes:
+                    values = compact_array(node, typecodes[lineage])
+                    if values is not None:
+                        return values
+                # Elements of arrays of data groups share the lineage of the array
+                return tuple(convert(item, lineage) for item in node)
+            if isinstance(node, str):
+                return sys.intern(node)  # e.g., one copy of each enumerator in enumeration arrays
+            return node
+
+        return convert(instance, ())
+
+    def load_compact(self, file_path):
+        """Return the compact (see compact) representation in a JSON file."""
+        return self.compact(load_json(file_path))
+
     def get_schema_version(self):
         return self.validator.schema["version"]
 
@@ -184,34 +671,53 @@ class A205Schema:
         """
         if lineage[-1] != "grid_variables":
             raise Exception(f"{lineage[-1]} is not a 'grid_variables' data group.")
+        orders = self.get_grid_variable_orders()
+        if tuple(lineage) not in orders:
+            orders[tuple(lineage)] = self._trace_grid_variable_orders(lineage)
+        alternatives, default = orders[tuple(lineage)]
+
+        # Alternate performance maps allowed. Make sure we get the right one
+        for _, order in alternatives:
+            if len(grid_vars) > 0 and all(var in order for var in grid_vars):
+                return order
+
+        if default is None:
+            raise Exception(
+                f"Unable to find schema for grid variables: {grid_vars}. Lineage: {lineage}"
+            )
+
+        return default
+
+    def get_grid_variable_orders(self):
+        """
+        Return a dictionary keyed by the lineage tuple of each 'grid_variables' data group in the
+        schema. Values are (alternatives, default): a list of (option index, grid variable order) for
+        the 'allOf' alternatives of the performance map, and the order given by the data group's own
+        schema (or None). The table is built on first use.
+        """
+        if self._grid_variable_orders is None:
+            self._grid_variable_orders = {}
+            for lineage, _, _ in self.iter_lineages():
+                if lineage[-1:] == ("grid_variables",) and lineage not in self._grid_variable_orders:
+                    self._grid_variable_orders[lineage] = self._trace_grid_variable_orders(list(lineage))
+        return self._grid_variable_orders
+
+    def _trace_grid_variable_orders(self, lineage):
         parent_schema_node = self.get_schema_node(lineage[:-2])
-        schema_node = None
+        alternatives = []
         if "allOf" in parent_schema_node:
-            # Alternate performance maps allowed. Make sure we get the right one
-            for option in parent_schema_node["allOf"]:
+            for i, option in enumerate(parent_schema_node["allOf"]):
                 # allOf resolutions are 2-deep dictionaries; resolve twice
                 # first confirm that the option we're starting with is a performance map type
                 option = self.resolve(option).get(lineage[-2])
                 if option is not None:
                     option = self.resolve(option)
-                    for var in grid_vars:
-                        option_grid_vars = self.resolve(option["grid_variables"])
-                        if var not in option_grid_vars:
-                            schema_node = None
-                            break
-                        else:
-                            schema_node = option_grid_vars
-                    if schema_node is not None:
-                        break
-        if schema_node is None:
-            schema_node = self.get_schema_node(lineage)["properties"]
-
-        if schema_node is None:
-            raise Exception(
-                f"Unable to find schema for grid variables: {grid_vars}. Lineage: {lineage}"
-            )
-
-        return [item for item in schema_node]
+                    alternatives.append((i, list(self.resolve(option["grid_variables"]))))
+        try:
+            default = list(self.get_schema_node(lineage)["properties"])
+        except KeyError:
+            default = None
+        return alternatives, default
 
     def create_grid_set(self, representation, lineage):
         grid_var_content = get_representation_node(representation, lineage)
@@ -219,25 +725,166 @@ class A205Schema:
         return create_grid_set(grid_var_content, order)
 
 
-def validate(file_path, schema_path):
+def version_key(version):
+    """
+    Return a sortable key for a "major.minor.patch" version string.
+    """
+    return tuple(int(x) if x.isdigit() else 0 for x in str(version).split("."))
+
+
+class SchemaRegistry:
+    """
+    Store of compiled A205Schema objects keyed by schema name (e.g., 'RS0004') and schema version.
+
+    Schemas are discovered from one or more directories of generated JSON schema files. Several
+    versions of the same schema may be registered side by side (one directory per version). Each
+    schema is compiled the first time it is requested and kept until it is evicted by the least-
+    recently-used policy.
+    """
+
+    def __init__(self, schema_dirs=None, max_size=16, strict_version=False):
+        """
+        :param schema_dirs:     Directory, or list of directories, containing *.schema.json files
+        :param max_size:        Maximum number of compiled schemas held at once
+        :param strict_version:  If False, an instance whose schema_version is not registered is
+                                validated against the latest registered version of its schema
+        """
+        self.max_size = max_size
+        self.strict_version = strict_version
+        self._paths = {}  # (schema, version) -> schema path
+        self._schemas = OrderedDict()  # (schema, version) -> A205Schema, least recent first
+        if isinstance(schema_dirs, (str, os.PathLike)):
+            schema_dirs = [schema_dirs]
+        for schema_dir in schema_dirs or []:
+            self.add_schema_dir(schema_dir)
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def __contains__(self, key):
+        return key in self._schemas
+
+    def add_schema_dir(self, schema_dir):
+        for file_name in sorted(os.listdir(schema_dir)):
+            if file_name.endswith(".schema.json"):
+                self.add_schema(os.path.join(schema_dir, file_name))
+
+    def add_schema(self, schema_path):
+        schema_name = os.path.basename(schema_path)[: -len(".schema.json")]
+        version = load_json(schema_path).get("version")
+        key = (schema_name, version)
+        if self._paths.get(key) != schema_path:
+            self._schemas.pop(key, None)
+        self._paths[key] = schema_path
+        return key
+
+    def versions(self, schema_name):
+        return sorted(
+            [version for name, version in self._paths if name == schema_name],
+            key=version_key,
+        )
+
+    def resolve_key(self, schema_name, version=None):
+        """
+        Return the registered (schema, version) key that should be used for the requested schema.
+        """
+        if (schema_name, version) in self._paths:
+            return (schema_name, version)
+        versions = self.versions(schema_name)
+        if len(versions) == 0:
+            raise Exception(f'Schema "{schema_name}" is not registered.')
+        if version is not None and self.strict_version:
+            raise Exception(
+                f'Version {version} of schema "{schema_name}" is not registered. Available versions: {versions}'
+            )
+        return (schema_name, versions[-1])
+
+    def get(self, schema_name, version=None):
+        key = self.resolve_key(schema_name, version)
+        if key in self._schemas:
+            self._schemas.move_to_end(key)
+        else:
+            self._schemas[key] = A205Schema(self._paths[key])
+            while len(self._schemas) > self.max_size:
+                self._schemas.popitem(last=False)
+        return self._schemas[key]
+
+    def get_for_instance(self, instance):
+        metadata = instance["metadata"]
+        return self.get(metadata["schema"], metadata.get("schema_version"))
+
+    def validate(self, instance, max_errors=None):
+        self.get_for_instance(instance).validate(instance, max_errors)
+
+    def load_compact(self, file_path):
+        """Return the compact representation (see A205Schema.compact) in a JSON file."""
+        instance = load_json(file_path)
+        return self.get_for_instance(instance).compact(instance)
+
+    def clear(self):
+        self._schemas.clear()
+
+
+def validate(file_path, schema_path, streaming=False, max_errors=None):
     a205schema = A205Schema(schema_path)
-    a205schema.validate(load_json(file_path))
+    if streaming:
+        a205schema.validate_stream(file_path)
+    else:
+        a205schema.validate(load_json(file_path), max_errors)
 
 
-def validate_directory(example_dir, schema_dir):
-    errors = []
-    for example in os.listdir(example_dir):
+def collect_files(example_dir):
+    """
+    Return a sorted list of the files found (recursively) in example_dir.
+    """
+    paths = []
+    for example in sorted(os.listdir(example_dir)):
         example_path = os.path.join(example_dir, example)
         if os.path.isdir(example_path):
-            errors += validate_directory(example_path, schema_dir)
-        else:
-            if "~$" not in example:  # Ignore temporary Excel files
-                try:
-                    schema_name = load_json(example_path)["metadata"]["schema"]
-                    schema_path = os.path.join(schema_dir, f"{schema_name}.schema.json")
-                    validate(example_path)
-                except Exception as e:  # Change to tk205 Exception
-                    errors.append(e)
+            paths += collect_files(example_path)
+        elif "~$" not in example:  # Ignore temporary Excel files
+            paths.append(example_path)
+    return paths
+
+
+def create_worker_registry(schema_dir):
+    """Return a registry for a worker process, which compiles each schema at most once."""
+    return SchemaRegistry(schema_dir, max_size=64)
+
+
+def _validate_file(registry, example_path):
+    """
+    Validate a single file using the worker's registry.
+    Return a tuple of (captured output, error or None) so that results can be reported in order.
+    """
+    output = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(output):
+        try:
+            registry.validate(load_json(example_path))
+        except Exception as e:  # Change to tk205 Exception
+            error = Exception(f"{e}")
+    return output.getvalue(), error
+
+
+def validate_directory(example_dir, schema_dir, jobs=1):
+    """
+    Validate every file in example_dir (recursively) against the schemas in schema_dir.
+
+    :param jobs:    Number of worker processes. If None, use the number of available CPUs.
+
+    Files are validated in sorted path order; output and errors are always reported in that order,
+    regardless of the number of jobs.
+    """
+    results = run_in_pool(
+        _validate_file, collect_files(example_dir), jobs, create_worker_registry, (schema_dir,)
+    )
+
+    errors = []
+    for output, error in results:
+        print(output, end="")
+        if error is not None:
+            errors.append(error)
     if len(errors) > 0:
         error_str = "\n\n".join([f"{e}" for e in errors])
         raise Exception(f"{error_str}")
@@ -0,0 +1,213 @@
+"""
+Time-series (e.g., 8760-hour) operation of chillers (RS0001) and DX units (RS0004), evaluating their
+performance maps for all time steps in batched calls.
+"""
+import numpy as np
+from .interpolate import PerformanceMap, LINEAR
+
+STAGE = "compressor_sequence_number"
+
+# Performance map, lookup variables and cycling degradation coefficient of each operating mode, and
+# the performance map of correction factors applied to its capacity and power (if any)
+OPERATING_MODES = {
+    "RS0001": {
+        "cooling": {
+            "performance_map": "performance_map_cooling",
+            "capacity": "net_evaporator_capacity",
+            "power": "input_power",
+            "cycling_degradation_coefficient": "cycling_degradation_coefficient",
+        },
+    },
+    "RS0004": {
+        "cooling": {
+            "performance_map": "performance_map_cooling",
+            "capacity": "gross_total_capacity",
+            "power": "gross_power",
+            "cycling_degradation_coefficient": "cooling_cycling_degradation_coefficient",
+        },
+        "heating": {
+            "performance_map": "performance_map_heating",
+            "capacity": "gross_frost_free_capacity",
+            "power": "gross_frost_free_power",
+            "cycling_degradation_coefficient": "heating_cycling_degradation_coefficient",
+            "correction_map": "performance_map_defrost_correction",
+            "capacity_correction": "capacity_correction_factor",
+            "power_correction": "power_correction_factor",
+        },
+    },
+}
+
+STANDBY_POWER = {"RS0001": "input_power", "RS0004": "gross_power"}
+
+COLUMNS = ["capacity", "power", STAGE, "part_load_ratio", "unmet_load", "out_of_range"]
+
+
+def get_targets(performance_map, conditions, steps):
+    """
+    Return the targets (len(steps), ndim) of a performance map for the given time steps. Grid
+    variables without conditions must have a single value. Compressor stages are set to the first.
+    Also returns whether each target is outside the grid.
+    """
+    axes = performance_map.interpolator.axes
+    targets = np.empty((len(steps), len(axes)))
+    out_of_range = np.zeros(len(steps), dtype=bool)
+    for i, (name, axis) in enumerate(zip(performance_map.grid_variable_names, axes)):
+        if name == STAGE:
+            targets[:, i] = axis[0]
+        elif name in conditions:
+            values = np.asarray(conditions[name], dtype=float)[steps]
+            targets[:, i] = values
+            out_of_range |= (values < axis[0]) | (values > axis[-1])
+        elif len(axis) == 1:
+            targets[:, i] = axis[0]
+        else:
+            raise Exception(f"No conditions given for grid variable '{name}'.")
+    return targets, out_of_range
+
+
+def evaluate_stages(performance_map, targets):
+    """
+    Return the compressor stages of a performance map and its lookup variables (len(targets), stages,
+    n_lookup) at each target for every stage, evaluated in one call.
+    """
+    stage_index = performance_map.grid_variable_names.index(STAGE)
+    stages = performance_map.interpolator.axes[stage_index]
+    n_steps, n_stages = len(targets), len(stages)
+    stage_targets = np.repeat(targets, n_stages, axis=0)
+    stage_targets[:, stage_index] = np.tile(stages, n_steps)
+    return stages, performance_map(stage_targets, LINEAR).reshape(n_steps, n_stages, -1)
+
+
+def operate(
+    performance_map, targets, load, cycling_degradation_coefficient, capacity_name, power_name, correction=None
+):
+    """
+    Return the columns of operation meeting a load (positive, for each target) with the available
+    compressor stages of a performance map (see stage_operation).
+
+    :param correction:  None, or a tuple of (performance map of correction factors, its targets, name
+                        of the capacity factor, name of the power factor). The capacity and power of
+                        each stage are multiplied by the factors of the same stage (e.g., for the
+                        effects of frost formation and defrost operation on heating).
+    """
+    stages, results = evaluate_stages(performance_map, targets)
+    capacities = results[:, :, performance_map.lookup_variable_names.index(capacity_name)]
+    powers = results[:, :, performance_map.lookup_variable_names.index(power_name)]
+    if correction is not None:
+        correction_map, correction_targets, capacity_factor_name, power_factor_name = correction
+        correction_stages, factors = evaluate_stages(correction_map, correction_targets)
+        if not np.array_equal(correction_stages, stages):
+            raise Exception("Compressor stages of the correction performance map differ from those of the performance map.")
+        capacities = capacities * factors[:, :, correction_map.lookup_variable_names.index(capacity_factor_name)]
+        powers = powers * factors[:, :, correction_map.lookup_variable_names.index(power_factor_name)]
+    return stage_operation(stages, capacities, powers, load, cycling_degradation_coefficient)
+
+
+def stage_operation(stages, capacities, powers, load, cycling_degradation_coefficient):
+    """
+    Return the columns of operation meeting a load (N) given the capacities and powers (N, stages) of
+    each compressor stage. Between stages, the unit alternates between the neighboring stages. Below
+    the lowest stage, it cycles with a part-load factor of 1 - C_D * (1 - part-load ratio). The
+    cycling degradation coefficient C_D is a single value or an array (N).
+    """
+    n_steps, n_stages = capacities.shape
+    columns = {
+        "capacity": np.minimum(load, capacities[:, -1]),
+        "unmet_load": np.maximum(load - capacities[:, -1], 0.0),
+        "part_load_ratio": np.ones(n_steps),
+    }
+
+    # Alternating between the lowest stage meeting the load and the stage below it (or at the
+    # highest stage if none meets the load)
+    steps = np.arange(n_steps)
+    meets_load = capacities > load[:, np.newaxis]
+    upper = np.where(meets_load[:, -1], np.argmax(meets_load, axis=1), n_stages - 1)
+    lower = np.maximum(upper - 1, 0)
+    span = capacities[steps, upper] - capacities[steps, lower]
+    fraction = np.divide(load - capacities[steps, lower], span, out=np.ones(n_steps), where=span > 0.0)
+    fraction = np.clip(fraction, 0.0, 1.0)
+    columns["power"] = powers[steps, lower] + fraction * (powers[steps, upper] - powers[steps, lower])
+    columns[STAGE] = stages[lower] + fraction * (stages[upper] - stages[lower])
+
+    # Cycling at the lowest stage
+    cycling = load < capacities[:, 0]
+    part_load_ratio = load[cycling] / capacities[cycling, 0]
+    cycling_degradation_coefficient = np.broadcast_to(cycling_degradation_coefficient, n_steps)[cycling]
+    part_load_factor = 1.0 - cycling_degradation_coefficient * (1.0 - part_load_ratio)
+    columns["part_load_ratio"][cycling] = part_load_ratio
+    columns["power"][cycling] = powers[cycling, 0] * part_load_ratio / part_load_factor
+    columns[STAGE][cycling] = stages[0]
+    return columns
+
+
+def simulate(schema, representation, conditions, load, clamp=True):
+    """
+    Simulate the operation of an RS0001 or RS0004 representation over a series of time steps.
+
+    :param schema:          A205Schema of the representation
+    :param conditions:      Dictionary of arrays (one value per time step) keyed by grid variable name.
+                            Grid variables of the performance maps without a single value must be
+                            included; other entries are ignored. RS0004 heating capacity and power
+                            are corrected for frost formation and defrost operation with the
+                            performance_map_defrost_correction, so its grid variables (e.g.,
+                            'outdoor_coil_entering_relative_humidity') are needed for heating.
+    :param load:            Array of loads (W) for each time step: positive for cooling, negative for
+                            heating (RS0004) and zero for standby
+    :param clamp:           If True, conditions outside the performance map grids are clamped to the
+                            grid. Otherwise, results at those time steps are NaN. Either way, those
+                            time steps are flagged in the 'out_of_range' column.
+
+    Returns a dictionary of arrays (one value per time step) with the COLUMNS: delivered capacity,
+    power, (effective) compressor stage, part-load ratio when cycling, unmet load and out-of-range
+    flags.
+    """
+    rs = representation["metadata"]["schema"]
+    if rs not in OPERATING_MODES:
+        raise Exception(f"Simulation of {rs} representations is not supported.")
+    load = np.asarray(load, dtype=float)
+    performance = representation["performance"]
+    columns = {name: np.zeros(len(load)) for name in COLUMNS}
+    columns["out_of_range"] = np.zeros(len(load), dtype=bool)
+
+    for mode, sign in [("cooling", 1.0), ("heating", -1.0)]:
+        steps = np.flatnonzero(sign * load > 0.0)
+        if len(steps) == 0:
+            continue
+        names = OPERATING_MODES[rs].get(mode)
+        if names is None or names["performance_map"] not in performance:
+            raise Exception(f"Representation has no {mode} performance map.")
+        performance_map = PerformanceMap(schema, representation, ["performance", names["performance_map"]])
+        targets, out_of_range = get_targets(performance_map, conditions, steps)
+        correction = None
+        if "correction_map" in names:
+            if names["correction_map"] not in performance:
+                raise Exception(f"Representation has no {names['correction_map']} for its {mode} performance map.")
+            correction_map = PerformanceMap(schema, representation, ["performance", names["correction_map"]])
+            correction_targets, correction_out_of_range = get_targets(correction_map, conditions, steps)
+            out_of_range |= correction_out_of_range
+            correction = (correction_map, correction_targets, names["capacity_correction"], names["power_correction"])
+        results = operate(
+            performance_map,
+            targets,
+            sign * load[steps],
+            performance[names["cycling_degradation_coefficient"]],
+            names["capacity"],
+            names["power"],
+            correction,
+        )
+        for name, values in results.items():
+            columns[name][steps] = values
+        columns["out_of_range"][steps] = out_of_range
+
+    steps = np.flatnonzero(load == 0.0)
+    if len(steps) > 0:
+        performance_map = PerformanceMap(schema, representation, ["performance", "performance_map_standby"])
+        targets, out_of_range = get_targets(performance_map, conditions, steps)
+        power = performance_map.lookup_variable_names.index(STANDBY_POWER[rs])
+        columns["power"][steps] = performance_map(targets)[:, power]
+        columns["out_of_range"][steps] = out_of_range
+
+    if not clamp:
+        for name in ["capacity", "power", STAGE, "part_load_ratio", "unmet_load"]:
+            columns[name][columns["out_of_range"]] = np.nan
+    return columns
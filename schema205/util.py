@@ -1,5 +1,11 @@
+import concurrent.futures
+import functools
 import itertools
+import math
+import os
 import re
+from collections.abc import Mapping, Sequence
+import numpy as np
 
 def get_representation_node(representation, lineage):
     node = representation
@@ -7,11 +13,138 @@ def get_representation_node(representation, lineage):
         node = node[name]
     return node
 
+_worker_state = None
+
+
+def _initialize_worker(initializer, initargs):
+    global _worker_state
+    _worker_state = initializer(*initargs) if initializer is not None else None
+
+
+def _call_worker(function, task):
+    return function(_worker_state, task)
+
+
+def run_in_pool(function, tasks, jobs=1, initializer=None, initargs=()):
+    """
+    Return [function(state, task) for task in tasks], in the order of tasks, spreading the tasks over
+    worker processes. The state of each process is initializer(*initargs) (or None), created once per
+    process (e.g., a schema registry or a translator) and shared by all of its tasks. With one job,
+    tasks run in the calling process.
+
+    :param jobs:    Number of worker processes. If None, use the number of available CPUs.
+    """
+    tasks = list(tasks)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(tasks)))
+    if jobs == 1:
+        state = initializer(*initargs) if initializer is not None else None
+        return [function(state, task) for task in tasks]
+    chunk_size = max(1, len(tasks) // (jobs * 4))
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_initialize_worker, initargs=(initializer, initargs)
+    ) as executor:
+        return list(executor.map(functools.partial(_call_worker, function), tasks, chunksize=chunk_size))
+
+
+class GridAxisView(Sequence):
+    """
+    Values of one grid variable at every point of a GridSet, computed from the axis on access.
+    """
+
+    def __init__(self, axis, stride, size):
+        self.axis = axis
+        self.stride = stride  # Number of consecutive points sharing an axis value
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("grid point index out of range")
+        return self.axis[(index // self.stride) % len(self.axis)]
+
+    def __iter__(self):
+        repeats = self.size // (self.stride * len(self.axis))
+        for _ in range(repeats):
+            for value in self.axis:
+                yield from itertools.repeat(value, self.stride)
+
+    def __array__(self, dtype=None, copy=None):
+        values = np.repeat(np.asarray(self.axis, dtype=dtype), self.stride)
+        return np.tile(values, self.size // len(values))
+
+    def __repr__(self):
+        return f"GridAxisView({self.axis!r}, stride={self.stride})"
+
+
+class GridSet(Mapping):
+    """
+    Cartesian product of grid variable axes, with the last variable varying fastest (the order of
+    lookup variable values). Only the axes are stored; point values are computed from strides.
+
+    As a mapping, each grid variable gives its values at every grid point (a GridAxisView).
+    """
+
+    def __init__(self, axes):
+        self.axes = dict(axes)  # Grid variable -> axis values, in grid order
+        self.shape = tuple(len(axis) for axis in self.axes.values())
+        self.size = math.prod(self.shape)
+        self.strides = []
+        stride = 1
+        for length in reversed(self.shape):
+            self.strides.insert(0, stride)
+            stride *= length
+        self.strides = tuple(self.strides)
+
+    def __getitem__(self, var):
+        return GridAxisView(self.axes[var], self.strides[list(self.axes).index(var)], self.size)
+
+    def __iter__(self):
+        return iter(self.axes)
+
+    def __len__(self):
+        return len(self.axes)
+
+    def point(self, index):
+        """Return the values of the grid variables at the index-th grid point."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("grid point index out of range")
+        return tuple(
+            axis[(index // stride) % length]
+            for axis, stride, length in zip(self.axes.values(), self.strides, self.shape)
+        )
+
+    def index(self, indices):
+        """Return the grid point index of a tuple of axis indices."""
+        return sum(i * stride for i, stride in zip(indices, self.strides))
+
+    def mesh(self):
+        """
+        Return read-only arrays (broadcast views, not copies) of each grid variable's values with the
+        grid's shape, like numpy.meshgrid(*axes, indexing="ij").
+        """
+        ndim = len(self.shape)
+        mesh = {}
+        for i, (var, axis) in enumerate(self.axes.items()):
+            values = np.asarray(axis, dtype=float).reshape([-1 if j == i else 1 for j in range(ndim)])
+            mesh[var] = np.broadcast_to(values, self.shape)
+        return mesh
+
+
 def create_grid_set(grid_variables, order):
-    lists = []
     if len(grid_variables) != len(order):
         raise Exception(f"order: {order} must contain the keys of 'grid_variables': {grid_variables}")
 
+    axes = {}
     for var in order:
         if var not in grid_variables:
             raise Exception(f"{var} not found in {order}")
@@ -19,16 +152,13 @@ def create_grid_set(grid_variables, order):
         if len(grid_variables[var]) == 0:
             #TODO: Probably should be an exception
             return None
-        lists.append(grid_variables[var])
-
-    grid = list(zip(*itertools.product(*lists)))
-    grid_set = {}
-    for i, var in enumerate(order):
-        grid_set[var] = grid[i]
+        axes[var] = grid_variables[var]
 
-    return grid_set
+    return GridSet(axes)
 
 def process_grid_set(grid_set):
+    if isinstance(grid_set, GridSet):
+        return {var: list(axis) for var, axis in grid_set.axes.items()}
     grid_vars = {}
     for var in grid_set:
         grid_vars[var] = list(set(grid_set[var]))
@@ -2,8 +2,8 @@ import os
 import json
 import posixpath
 import jsonschema
-import yaml
 import sys
+from schema205.file_io import load_source
 
 class A205MetaSchema:
   def __init__(self, schema_path):
@@ -16,10 +16,10 @@ class A205MetaSchema:
       self.validator = jsonschema.Draft7Validator(json.load(meta_schema_file), resolver=resolver)
 
   def validate(self, instance_path):
-    with open(os.path.join(instance_path), 'r') as input_file:
-      instance = yaml.load(input_file, Loader=yaml.FullLoader)
+    self.validate_instance(load_source(instance_path), os.path.basename(instance_path))
+
+  def validate_instance(self, instance, file_name):
     errors = sorted(self.validator.iter_errors(instance), key=lambda e: e.path)
-    file_name =  os.path.basename(instance_path)
     if len(errors) == 0:
       print(f"Validation successful for {file_name}")
     else:
@@ -0,0 +1,55 @@
+"""
+Test the single-pass build against the separate build tasks, and parallel against serial generation.
+"""
+import filecmp
+import os
+import schema205.build
+import schema205.cpp_translate
+import schema205.json_translate
+import schema205.markdown
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), "..", "schema-source")
+OUTPUT_NAMES = ["schema", "docs", "include", "cpp"]
+
+
+def assert_same_files(left, right):
+    comparison = filecmp.dircmp(left, right)
+    assert comparison.left_only == [] and comparison.right_only == []
+    _, mismatches, errors = filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)
+    assert mismatches == [] and errors == []
+
+
+def build_separately(out_dir, jobs=1):
+    for name in OUTPUT_NAMES:
+        os.makedirs(out_dir / name)
+    schema205.json_translate.translate_dir(SOURCE_DIR, out_dir / "schema", jobs=jobs)
+    schema205.markdown.write_dir(SOURCE_DIR, out_dir / "docs", jobs=jobs)
+    schema205.cpp_translate.translate_all_to_source(SOURCE_DIR, out_dir / "include", out_dir / "cpp", "tk205", jobs=jobs)
+
+
+def test_build_all(tmp_path):
+    timings = schema205.build.build_all(SOURCE_DIR, tmp_path / "all")
+    assert list(timings) == ["load", "validate", "schema", "bundle", "doc", "cpp", "render_template"]
+
+    build_separately(tmp_path / "separate")
+    for name in OUTPUT_NAMES:
+        assert_same_files(tmp_path / "all" / name, tmp_path / "separate" / name)
+    assert os.path.getsize(tmp_path / "all" / "rendered_template" / "main.md") > 0
+
+
+def test_parallel_generation(tmp_path, capsys):
+    build_separately(tmp_path / "serial", jobs=1)
+    serial_output = capsys.readouterr().out
+    build_separately(tmp_path / "parallel", jobs=2)
+    assert capsys.readouterr().out == serial_output
+    for name in OUTPUT_NAMES:
+        assert_same_files(tmp_path / "serial" / name, tmp_path / "parallel" / name)
+
+
+def test_source_dependencies():
+    dependencies = schema205.build.get_source_dependencies(SOURCE_DIR)
+    assert dependencies["ASHRAE205"] == []
+    assert dependencies["RS0001"] == ["ASHRAE205"]
+    # RS0002 nests RS0003, which nests RS0005 (which nests RS0006) and RS0007
+    assert dependencies["RS0003"] == ["ASHRAE205", "RS0005", "RS0006", "RS0007"]
+    assert dependencies["RS0002"] == ["ASHRAE205", "RS0003", "RS0004", "RS0005", "RS0006", "RS0007"]
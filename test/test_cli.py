@@ -0,0 +1,51 @@
+"""
+Test the command line interface.
+"""
+import os
+import pytest
+import schema205
+from schema205.cli import get_output_path, main
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+
+
+def test_output_path():
+    assert get_output_path("a/HPDM.RS0004.a205.json", "out/*.cbor", "cbor") == "out/HPDM.RS0004.a205.cbor"
+    assert get_output_path("a/HPDM.RS0004.a205.json", "out", "yaml") == os.path.join("out", "HPDM.RS0004.a205.yaml")
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_convert(tmp_path, capsys, jobs):
+    inputs = os.path.join("examples", "RS0001", "*.a205.json")
+    cbor_output = str(tmp_path / "cbor" / "*.cbor")
+    assert main(["convert", inputs, "-o", cbor_output, "-j", jobs, "--validate", "--schema-dir", SCHEMA_DIR]) == 0
+    report = capsys.readouterr().out
+    assert report.startswith("Converted ") and "files/s" in report
+
+    # Through every format and back to JSON
+    assert main(["convert", cbor_output, "-o", str(tmp_path / "yaml"), "-f", "yaml", "-j", jobs]) == 0
+    yaml_output = str(tmp_path / "yaml" / "*.yaml")
+    columnar_output = str(tmp_path / "col" / "*.col")
+    assert main(["convert", yaml_output, "-o", columnar_output, "-j", jobs, "--schema-dir", SCHEMA_DIR]) == 0
+    assert main(["convert", columnar_output, "-o", str(tmp_path / "json" / "*.json"), "-j", jobs]) == 0
+    for path in schema205.schema.collect_files(os.path.join("examples", "RS0001")):
+        converted = tmp_path / "json" / os.path.basename(path)
+        assert schema205.load_json(converted) == schema205.load_json(path)
+
+
+def test_convert_invalid(tmp_path, capsys):
+    inputs = os.path.join("test", "bad-examples", "*")
+    output = str(tmp_path / "*.cbor")
+    assert main(["convert", inputs, "-o", output, "-j", "2", "--validate", "--schema-dir", SCHEMA_DIR]) == 1
+    captured = capsys.readouterr()
+    assert "Validation failed" in captured.err
+    assert captured.out.startswith("Converted 0 of")
+    assert os.listdir(tmp_path) == []
+
+    # Without validation, the files are converted
+    assert main(["convert", inputs, "-o", output]) == 0
+    assert len(os.listdir(tmp_path)) == len(os.listdir(os.path.join("test", "bad-examples")))
+
+    assert main(["convert", str(tmp_path / "none*.json"), "-o", output]) == 1
+    with pytest.raises(Exception):
+        main(["convert", inputs, "-o", str(tmp_path / "*.txt")])
@@ -0,0 +1,81 @@
+"""
+Test the columnar container of representations.
+"""
+import mmap
+import os
+import numpy as np
+import pytest
+import schema205
+from schema205.cli import to_plain
+from schema205.columnar import ALIGNMENT, dump_columnar, export_dir, load_columnar
+from schema205.interpolate import PerformanceMap
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+HPDM = os.path.join("examples", "RS0004", "HPDM.RS0004.a205.json")
+
+
+def test_round_trip(tmp_path):
+    registry = schema205.SchemaRegistry(SCHEMA_DIR)
+    container_paths = export_dir("examples", SCHEMA_DIR, tmp_path)
+    json_paths = [path for path in schema205.schema.collect_files("examples") if path.endswith(".a205.json")]
+    assert len(container_paths) == len(json_paths)
+    for json_path, container_path in zip(json_paths, container_paths):
+        original = schema205.load_json(json_path)
+        loaded = load_columnar(container_path)
+        assert to_plain(loaded) == original
+        registry.validate(loaded)
+
+
+def test_memory_map(tmp_path):
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0004.schema.json"))
+    representation = schema205.load_json(HPDM)
+    container_path = tmp_path / "HPDM.RS0004.a205.col"
+    dump_columnar(representation, schema, container_path)
+
+    loaded = load_columnar(container_path)
+    lineage = ["performance", "performance_map_cooling"]
+    lookup_variables = loaded["performance"]["performance_map_cooling"]["lookup_variables"]
+    grid_variables = loaded["performance"]["performance_map_cooling"]["grid_variables"]
+    capacity = lookup_variables["gross_total_capacity"]
+    assert capacity.dtype == np.float64 and not capacity.flags.writeable
+    assert isinstance(capacity.base, memoryview) and isinstance(capacity.base.obj, mmap.mmap)
+    assert capacity.ctypes.data % ALIGNMENT == 0
+    assert grid_variables["compressor_sequence_number"].dtype == np.int64
+    assert isinstance(lookup_variables["operation_state"], list)
+    with pytest.raises(ValueError):
+        capacity[0] = 0.0
+
+    # Each load maps the file again (the operating system shares the pages of the mappings)
+    other = load_columnar(container_path)["performance"]["performance_map_cooling"]["lookup_variables"]
+    np.testing.assert_array_equal(capacity, other["gross_total_capacity"])
+
+    performance_map = PerformanceMap(schema, loaded, lineage)
+    expected = PerformanceMap(schema, representation, lineage)
+    np.testing.assert_array_equal(performance_map.interpolator.table, expected.interpolator.table)
+
+
+def test_float32(tmp_path):
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0004.schema.json"))
+    representation = schema205.load_json(HPDM)
+    full_path = tmp_path / "full.a205.col"
+    quantized_path = tmp_path / "quantized.a205.col"
+    dump_columnar(representation, schema, full_path)
+    dump_columnar(representation, schema, quantized_path, float32=True)
+    loaded = load_columnar(quantized_path)["performance"]["performance_map_cooling"]
+    original = representation["performance"]["performance_map_cooling"]
+    quantized_values = sum(
+        len(values) for values in loaded["lookup_variables"].values() if isinstance(values, np.ndarray)
+    )
+    assert os.path.getsize(full_path) - os.path.getsize(quantized_path) >= 4 * quantized_values - ALIGNMENT
+    assert loaded["lookup_variables"]["gross_power"].dtype == np.float32
+    np.testing.assert_allclose(loaded["lookup_variables"]["gross_power"], original["lookup_variables"]["gross_power"], rtol=1e-7)
+    # Grid axes keep full precision
+    for name, axis in original["grid_variables"].items():
+        assert loaded["grid_variables"][name].tolist() == axis
+
+
+def test_invalid_container(tmp_path):
+    invalid_path = tmp_path / "invalid.a205.col"
+    invalid_path.write_bytes(b"{}")
+    with pytest.raises(Exception):
+        load_columnar(invalid_path)
@@ -0,0 +1,207 @@
+"""
+Test the performance map interpolator.
+"""
+import concurrent.futures
+import os
+import numpy as np
+import pytest
+import schema205
+from schema205.interpolate import PerformanceMap, RegularGridInterpolator, SequentialQuery
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+AXES = [[0.0, 1.0, 3.0], [10.0, 20.0], [5.0], [-1.0, 0.0, 2.0, 4.0]]
+
+
+def multilinear(x):
+    # Reproduced exactly by (multi)linear interpolation
+    return 2.0 + x[..., 0] - 3.0 * x[..., 1] + 0.5 * x[..., 3] + x[..., 0] * x[..., 1] * x[..., 3]
+
+
+def make_interpolator():
+    points = np.array(np.meshgrid(*AXES, indexing="ij")).reshape(len(AXES), -1).T
+    return RegularGridInterpolator(AXES, [multilinear(points), np.ones(len(points))])
+
+
+def test_grid_points():
+    interpolator = make_interpolator()
+    points = np.array(np.meshgrid(*AXES, indexing="ij")).reshape(len(AXES), -1).T
+    results = interpolator(points)
+    assert results.shape == (len(points), 2)
+    np.testing.assert_allclose(results[:, 0], multilinear(points))
+
+
+def test_interpolation():
+    interpolator = make_interpolator()
+    rng = np.random.default_rng(0)
+    targets = np.column_stack(
+        [rng.uniform(axis[0], axis[-1], 1000) for axis in AXES]
+    )
+    results = interpolator(targets)
+    np.testing.assert_allclose(results[:, 0], multilinear(targets))
+    np.testing.assert_allclose(results[:, 1], 1.0)
+
+
+def test_constant_extrapolation():
+    interpolator = make_interpolator()
+    targets = np.array([[-5.0, 30.0, 0.0, 10.0], [3.5, 0.0, 9.0, -2.0]])
+    clamped = np.array([[0.0, 20.0, 5.0, 4.0], [3.0, 10.0, 5.0, -1.0]])
+    np.testing.assert_allclose(interpolator(targets), interpolator(clamped))
+
+
+def test_invalid_grid():
+    with pytest.raises(Exception):
+        RegularGridInterpolator([[0.0, 0.0]], [[1.0, 2.0]])
+    with pytest.raises(Exception):
+        RegularGridInterpolator([[0.0, 1.0]], [[1.0, 2.0, 3.0]])
+    with pytest.raises(Exception):
+        make_interpolator()([[0.0, 1.0]])
+
+
+def test_performance_map():
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0004.schema.json"))
+    rep = schema205.load_json(os.path.join("examples", "RS0004", "HPDM.RS0004.a205.json"))
+    lineage = ["performance", "performance_map_cooling"]
+    performance_map = PerformanceMap(schema, rep, lineage)
+    grid_variables = rep["performance"]["performance_map_cooling"]["grid_variables"]
+    lookup_variables = rep["performance"]["performance_map_cooling"]["lookup_variables"]
+    assert performance_map.grid_variable_names == list(grid_variables)
+    assert "operation_state" not in performance_map.lookup_variable_names
+
+    grid_set = schema.create_grid_set(rep, lineage + ["grid_variables"])
+    index = grid_set.index((1, 2, 3, 1, 0, 1))
+    performance = performance_map.calculate_performance(grid_set.point(index))
+    for name in performance_map.lookup_variable_names:
+        assert performance[name] == pytest.approx(lookup_variables[name][index])
+
+    # Halfway between grid points along one axis
+    target = dict(zip(grid_set, grid_set.point(index)))
+    above = grid_set.index((1, 2, 3, 1, 0, 2))
+    name = performance_map.grid_variable_names[-1]
+    target[name] = (target[name] + grid_set.point(above)[-1]) / 2
+    performance = performance_map.calculate_performance(target)
+    for name in performance_map.lookup_variable_names:
+        expected = (lookup_variables[name][index] + lookup_variables[name][above]) / 2
+        assert performance[name] == pytest.approx(expected)
+
+
+def test_cubic_interpolation():
+    # Centered-difference slopes are exact for quadratics on uniform axes, so cubic Hermite
+    # interpolation reproduces them away from the ends of the axes
+    x_axis = np.linspace(0.0, 5.0, 6)
+    y_axis = np.linspace(-2.0, 2.0, 5)
+    points = np.array(np.meshgrid(x_axis, y_axis, indexing="ij")).reshape(2, -1).T
+
+    def quadratic(x):
+        return 1.0 + x[..., 0] ** 2 - 2.0 * x[..., 0] * x[..., 1] ** 2
+
+    interpolator = RegularGridInterpolator([x_axis, y_axis], [quadratic(points)])
+    rng = np.random.default_rng(0)
+    targets = np.column_stack([rng.uniform(1.0, 4.0, 200), rng.uniform(-1.0, 1.0, 200)])
+    np.testing.assert_allclose(interpolator(targets, "cubic")[:, 0], quadratic(targets))
+    assert not np.allclose(interpolator(targets)[:, 0], quadratic(targets))
+    np.testing.assert_allclose(interpolator(points, "cubic")[:, 0], quadratic(points))
+
+    # Cubic along x only: exact for a function that is quadratic in x and linear in y
+    def mixed(x):
+        return x[..., 0] ** 2 * (1.0 + x[..., 1])
+
+    interpolator = RegularGridInterpolator([x_axis, y_axis], [mixed(points), quadratic(points)])
+    results = interpolator(targets, ["cubic", "linear"])
+    np.testing.assert_allclose(results[:, 0], mixed(targets))
+    # Slope tables are computed once per combination of cubic axes
+    assert list(interpolator._hermite_tables) == [(0,)]
+
+    # Two-point axes and constant extrapolation behave as in linear interpolation
+    interpolator = make_interpolator()
+    targets = np.array([[0.5, 12.0, 5.0, 1.0], [-5.0, 30.0, 0.0, 10.0]])
+    cubic = interpolator(targets, ["linear", "cubic", "cubic", "linear"])
+    np.testing.assert_allclose(cubic, interpolator(targets))
+
+
+@pytest.mark.parametrize("methods", ["linear", "cubic", ["cubic", "linear", "linear", "cubic"]])
+def test_sequential_query(methods):
+    interpolator = make_interpolator()
+    query = SequentialQuery(interpolator, methods)
+    # Slope tables are only computed for cubic axes
+    assert bool(interpolator._hermite_tables) == ("cubic" in methods)
+    rng = np.random.default_rng(0)
+    # Slowly moving targets, including excursions beyond the grid
+    steps = rng.normal(0.0, 0.2, (500, len(AXES)))
+    targets = np.cumsum(steps, axis=0) + [1.0, 15.0, 5.0, 1.0]
+    targets = np.repeat(targets, 2, axis=0)  # Repeated targets reuse weights
+    expected = interpolator(targets, methods)
+    for target, result in zip(targets, expected):
+        np.testing.assert_allclose(query(target), result)
+    # Most axis lookups are resolved from the previous cell or its neighbors
+    assert query.searches < len(targets) // 10
+
+    # Queries on the same interpolator are independent
+    other = SequentialQuery(interpolator, methods)
+    np.testing.assert_allclose(other(targets[-1]), expected[-1])
+    np.testing.assert_allclose(query(targets[0]), expected[0])
+    with pytest.raises(Exception):
+        query([0.0])
+
+
+def test_sequential_query_threads():
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0004.schema.json"))
+    rep = schema205.load_json(os.path.join("examples", "RS0004", "HPDM.RS0004.a205.json"))
+    performance_map = PerformanceMap(schema, rep, ["performance", "performance_map_cooling"])
+    rng = np.random.default_rng(0)
+    axes = performance_map.interpolator.axes
+    series = [
+        np.column_stack([rng.uniform(axis[0], axis[-1], 200) for axis in axes]) for _ in range(4)
+    ]
+
+    def run(targets):
+        query = performance_map.query("cubic")
+        return np.array([query(target) for target in targets])
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(run, series))
+    for targets, result in zip(series, results):
+        np.testing.assert_allclose(result, performance_map(targets, "cubic"))
+
+
+def test_map_view():
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0004.schema.json"))
+    rep = schema205.load_json(os.path.join("examples", "RS0004", "HPDM.RS0004.a205.json"))
+    lineage = ["performance", "performance_map_cooling"]
+    performance_map = PerformanceMap(schema, rep, lineage)
+    lookup_variables = rep["performance"]["performance_map_cooling"]["lookup_variables"]
+    grid_set = schema.create_grid_set(rep, lineage + ["grid_variables"])
+    view = performance_map.view()
+    assert view.shape == grid_set.shape
+    assert list(view) == performance_map.lookup_variable_names
+
+    capacity = view["gross_total_capacity"]
+    assert capacity.shape == grid_set.shape
+    assert np.shares_memory(capacity, performance_map.interpolator.table)
+    assert capacity[1, 2, 3, 1, 0, 1] == lookup_variables["gross_total_capacity"][grid_set.index((1, 2, 3, 1, 0, 1))]
+    with pytest.raises(ValueError):
+        capacity[0, 0, 0, 0, 0, 0] = 0.0
+    for axis in view.axes.values():
+        with pytest.raises(ValueError):
+            axis[0] = 0.0
+
+    # Fixing a grid variable removes its axis; slices keep it
+    stage = "compressor_sequence_number"
+    outdoor = "outdoor_coil_entering_dry_bulb_temperature"
+    stage_axis = view.axes[stage]
+    outdoor_axis = view.axes[outdoor]
+    subset = view.sel(**{stage: stage_axis[-1], outdoor: slice(outdoor_axis[1], outdoor_axis[3])})
+    assert stage not in subset.axes
+    np.testing.assert_array_equal(subset.axes[outdoor], outdoor_axis[1:4])
+    i, j = view.grid_variable_names.index(stage), view.grid_variable_names.index(outdoor)
+    expected = np.moveaxis(capacity, (i, j), (0, 1))[-1, 1:4]
+    np.testing.assert_array_equal(
+        np.moveaxis(subset["gross_total_capacity"], j - (i < j), 0), expected
+    )
+    assert np.shares_memory(subset["gross_total_capacity"], performance_map.interpolator.table)
+    assert not subset.axes[outdoor].flags.writeable and not subset["gross_total_capacity"].flags.writeable
+    assert subset.isel(**{outdoor: 0}).shape == subset.shape[: j - (i < j)] + subset.shape[j - (i < j) + 1 :]
+
+    with pytest.raises(Exception):
+        view.sel(**{stage: 0.5})
+    with pytest.raises(Exception):
+        view.isel(not_a_grid_variable=0)
@@ -0,0 +1,86 @@
+"""
+Test the part-load rating calculator.
+"""
+import glob
+import os
+import shutil
+import stat
+import numpy as np
+import pytest
+import schema205
+from schema205.rating import RATING_POINTS, load_rating_map, rate, rate_files, write_ratings
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+PATHS = sorted(glob.glob(os.path.join("examples", "RS0001", "*.RS0001.a205.json")))
+
+
+def test_rate_corpus(tmp_path):
+    rows = rate_files(PATHS, SCHEMA_DIR)
+    assert [row["file"] for row in rows] == [os.path.basename(path) for path in PATHS]
+    for row in rows:
+        cops = [row[f"cop_{round(point[0] * 100)}"] for point in RATING_POINTS]
+        assert row["iplv"] == pytest.approx(sum(cop * point[1] for cop, point in zip(cops, RATING_POINTS)))
+        assert row["capacity"] > 0.0 and all(cop > 0.0 for cop in cops)
+
+    constant = next(row for row in rows if row["file"] == "Chiller-Constant-Efficiency.RS0001.a205.json")
+    assert constant["iplv"] == pytest.approx(5.9)
+
+    # Rating maps together or one at a time gives the same ratings
+    registry = schema205.SchemaRegistry(SCHEMA_DIR)
+    rating_maps = [load_rating_map(path, registry) for path in PATHS]
+    air_cooled = [rating_map for rating_map in rating_maps if rating_map.condenser_type == "AIR"]
+    together = rate(air_cooled)
+    for i, rating_map in enumerate(air_cooled):
+        alone = rate([rating_map])
+        for name in together:
+            assert together[name][i] == pytest.approx(alone[name][0])
+
+    output_path = tmp_path / "ratings.csv"
+    write_ratings(rows, output_path)
+    assert len(output_path.read_text().splitlines()) == len(rows) + 1
+
+
+def test_rate_parallel(tmp_path):
+    cache_dir = tmp_path / "cache"
+    serial = rate_files(PATHS[:6], SCHEMA_DIR)
+    parallel = rate_files(PATHS[:6], SCHEMA_DIR, jobs=2, cache_dir=cache_dir)
+    assert parallel == serial
+    assert len(os.listdir(cache_dir)) == 6
+    # Cached maps are reused
+    assert rate_files(PATHS[:6], SCHEMA_DIR, cache_dir=cache_dir) == serial
+
+
+def test_rating_cache(tmp_path, monkeypatch):
+    registry = schema205.SchemaRegistry(SCHEMA_DIR)
+    path = tmp_path / "chiller.RS0001.a205.json"
+    shutil.copy(PATHS[0], path)
+    cache_dir = tmp_path / "cache"
+    rating_map = load_rating_map(path, registry, cache_dir)
+    assert np.array_equal(load_rating_map(path, None, cache_dir).capacity, rating_map.capacity)
+
+    # Modified files are parsed again
+    representation = schema205.load_json(path)
+    capacity = representation["performance"]["performance_map_cooling"]["lookup_variables"]["net_evaporator_capacity"]
+    capacity[:] = [2.0 * value for value in capacity]
+    schema205.dump(representation, path)
+    os.utime(path, ns=(0, 0))
+    np.testing.assert_allclose(load_rating_map(path, registry, cache_dir).capacity, 2.0 * rating_map.capacity)
+
+    # Entries of classes that no longer exist are rebuilt
+    (entry_path,) = [cache_dir / name for name in os.listdir(cache_dir)]
+    for stale_entry in [b"cschema205.rating\nOldRatingMap\n.", b"cno_such_module\nRatingMap\n."]:
+        entry_path.write_bytes(stale_entry)
+        np.testing.assert_allclose(load_rating_map(path, registry, cache_dir).capacity, 2.0 * rating_map.capacity)
+
+    # Entries in a directory that other users can write to are never read
+    if hasattr(os, "getuid"):
+        assert stat.S_IMODE(os.stat(cache_dir).st_mode) & 0o077 == 0
+        os.chmod(cache_dir, 0o777)
+        def fail(*args, **kwargs):
+            raise AssertionError("unpickled")
+
+        monkeypatch.setattr(schema205.file_io.pickle, "load", fail)
+        np.testing.assert_allclose(load_rating_map(path, registry, cache_dir).capacity, 2.0 * rating_map.capacity)
+
+    with pytest.raises(Exception):
+        load_rating_map(os.path.join("examples", "RS0004", "HPDM.RS0004.a205.json"), registry, cache_dir)
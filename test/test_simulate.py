@@ -0,0 +1,164 @@
+"""
+Test the time-series simulation driver.
+"""
+import os
+import numpy as np
+import pytest
+import schema205
+from schema205.simulate import simulate
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+
+
+def dx_unit():
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0004.schema.json"))
+    rep = schema205.load_json(os.path.join("examples", "RS0004", "DX-Constant-Efficiency.RS0004.a205.json"))
+    return schema, rep
+
+
+def dx_conditions(n):
+    return {
+        "outdoor_coil_entering_dry_bulb_temperature": np.full(n, 283.15),
+        "indoor_coil_entering_relative_humidity": np.full(n, 0.0),
+        "indoor_coil_entering_dry_bulb_temperature": np.full(n, 283.15),
+        "indoor_coil_air_mass_flow_rate": np.full(n, 5.4),
+        "ambient_absolute_air_pressure": np.full(n, 81.273),
+        "outdoor_coil_environment_dry_bulb_temperature": np.full(n, 283.15),
+    }
+
+
+def test_simulate_dx():
+    schema, rep = dx_unit()
+    lookup_variables = rep["performance"]["performance_map_cooling"]["lookup_variables"]
+    # First grid point for each stage (the second-to-last grid variable)
+    capacities = lookup_variables["gross_total_capacity"][0:4:2]
+    powers = lookup_variables["gross_power"][0:4:2]
+    cd = rep["performance"]["cooling_cycling_degradation_coefficient"]
+
+    load = np.array([0.0, capacities[0] / 4, capacities[0], sum(capacities) / 2, 2 * capacities[1]])
+    results = simulate(schema, rep, dx_conditions(len(load)), load)
+    assert set(results) == set(schema205.simulate.COLUMNS)
+    assert all(len(values) == len(load) for values in results.values())
+
+    # Standby
+    standby_power = rep["performance"]["performance_map_standby"]["lookup_variables"]["gross_power"][0]
+    assert results["power"][0] == pytest.approx(standby_power)
+    # Cycling at the lowest stage
+    assert results["part_load_ratio"][1] == pytest.approx(0.25)
+    assert results["power"][1] == pytest.approx(powers[0] * 0.25 / (1.0 - cd * 0.75))
+    # Lowest stage at full load
+    assert results["power"][2] == pytest.approx(powers[0])
+    assert results["compressor_sequence_number"][2] == pytest.approx(1.0)
+    # Alternating between stages
+    assert results["compressor_sequence_number"][3] == pytest.approx(1.5)
+    assert results["power"][3] == pytest.approx(sum(powers) / 2)
+    # Capacity limited
+    assert results["capacity"][4] == pytest.approx(capacities[1])
+    assert results["unmet_load"][4] == pytest.approx(capacities[1])
+    assert np.allclose(results["capacity"][:4], load[:4])
+    assert not results["out_of_range"].any()
+
+
+def test_simulate_out_of_range():
+    schema, rep = dx_unit()
+    conditions = dx_conditions(3)
+    conditions["outdoor_coil_entering_dry_bulb_temperature"] = np.array([273.15, 283.15, 283.15])
+    conditions["outdoor_coil_environment_dry_bulb_temperature"] = np.array([283.15, 283.15, 250.0])
+    load = np.array([1000.0, 1000.0, 0.0])
+
+    clamped = simulate(schema, rep, conditions, load)
+    assert clamped["out_of_range"].tolist() == [True, False, True]
+    assert clamped["power"][0] == pytest.approx(clamped["power"][1])
+
+    flagged = simulate(schema, rep, conditions, load, clamp=False)
+    assert np.isnan(flagged["power"][[0, 2]]).all()
+    assert flagged["power"][1] == pytest.approx(clamped["power"][1])
+
+    # Heating without a heating performance map
+    with pytest.raises(Exception):
+        simulate(schema, rep, dx_conditions(1), [-1000.0])
+    # Missing conditions
+    with pytest.raises(Exception):
+        simulate(schema, rep, {}, [1000.0])
+
+
+def heat_pump():
+    """DX unit with heating and defrost correction maps (two outdoor temperatures and two stages)."""
+    schema, rep = dx_unit()
+    performance = rep["performance"]
+    performance["heating_cycling_degradation_coefficient"] = 0.1
+    performance["performance_map_heating"] = {
+        "grid_variables": {
+            "outdoor_coil_entering_dry_bulb_temperature": [263.15, 283.15],
+            "indoor_coil_entering_dry_bulb_temperature": [283.15],
+            "indoor_coil_air_mass_flow_rate": [5.4],
+            "compressor_sequence_number": [1, 2],
+        },
+        "lookup_variables": {
+            "gross_frost_free_capacity": [5000.0, 10000.0, 8000.0, 16000.0],
+            "gross_frost_free_power": [2000.0, 3500.0, 2200.0, 4000.0],
+            "operation_state": ["NORMAL"] * 4,
+        },
+    }
+    performance["performance_map_defrost_correction"] = {
+        "grid_variables": {
+            "outdoor_coil_entering_dry_bulb_temperature": [263.15, 283.15],
+            "outdoor_coil_entering_relative_humidity": [0.8],
+            "compressor_sequence_number": [1, 2],
+        },
+        "lookup_variables": {
+            "capacity_correction_factor": [0.8, 0.8, 1.0, 1.0],
+            "power_correction_factor": [1.1, 1.1, 1.0, 1.0],
+            "defrost_time_fraction": [0.1, 0.1, 0.0, 0.0],
+        },
+    }
+    return schema, rep
+
+
+def test_simulate_heating_defrost():
+    schema, rep = heat_pump()
+    conditions = dx_conditions(4)
+    conditions["outdoor_coil_entering_dry_bulb_temperature"] = np.array([263.15, 263.15, 263.15, 283.15])
+    conditions["outdoor_coil_entering_relative_humidity"] = np.full(4, 0.8)
+    load = np.array([-4000.0, -2000.0, -20000.0, -8000.0])
+    results = simulate(schema, rep, conditions, load)
+
+    # Frost formation and defrost reduce the lowest stage from 5000 W to 4000 W and increase its power
+    assert results["capacity"][0] == pytest.approx(4000.0)
+    assert results["power"][0] == pytest.approx(2000.0 * 1.1)
+    assert results["compressor_sequence_number"][0] == pytest.approx(1.0)
+    assert results["part_load_ratio"][1] == pytest.approx(0.5)
+    assert results["power"][1] == pytest.approx(2200.0 * 0.5 / (1.0 - 0.1 * 0.5))
+    assert results["capacity"][2] == pytest.approx(8000.0)
+    assert results["unmet_load"][2] == pytest.approx(12000.0)
+    assert results["power"][2] == pytest.approx(3500.0 * 1.1)
+    # No correction where there is no frost
+    assert results["capacity"][3] == pytest.approx(8000.0)
+    assert results["power"][3] == pytest.approx(2200.0)
+    assert not results["out_of_range"].any()
+
+    # The correction map is required for heating
+    del rep["performance"]["performance_map_defrost_correction"]
+    with pytest.raises(Exception, match="performance_map_defrost_correction"):
+        simulate(schema, rep, dx_conditions(1), [-1000.0])
+
+
+def test_simulate_chiller_year():
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR, "RS0001.schema.json"))
+    rep = schema205.load_json(
+        os.path.join("examples", "RS0001", "ASHRAE90-1-2022-AppJ-Curve-Set-A.RS0001.a205.json")
+    )
+    hours = np.arange(8760)
+    outdoor = 291.15 - 12.0 * np.cos(2.0 * np.pi * hours / 8760)
+    conditions = {
+        "evaporator_liquid_leaving_temperature": np.full(8760, 280.0),
+        "condenser_air_entering_drybulb_temperature": outdoor,
+        "environment_dry_bulb_temperature": outdoor,
+    }
+    capacity = max(rep["performance"]["performance_map_cooling"]["lookup_variables"]["net_evaporator_capacity"])
+    load = np.clip((outdoor - 288.15) / 15.0, 0.0, 1.0) * capacity
+    results = simulate(schema, rep, conditions, load)
+    running = load > 0.0
+    assert (results["power"][running] > 0.0).all()
+    assert np.allclose(results["capacity"] + results["unmet_load"], load)
+    assert (results["compressor_sequence_number"][running] >= 1).all()
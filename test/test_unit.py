@@ -1,5 +1,15 @@
 import schema205
 import os
+import pytest
+import jsonschema
+import copy
+import itertools
+import numpy
+import tracemalloc
+import pickle
+import schema205.json_translate
+import schema205.markdown
+from schema205.interpolate import PerformanceMap
 
 """
 Unit tests
@@ -189,6 +199,33 @@ def test_get_grid_variable_order():
     assert order == grid_vars_names
 
 
+def test_grid_variable_orders(monkeypatch):
+    schema = schema205.A205Schema(
+        os.path.join(
+            os.path.dirname(__file__), "..", "build", "schema", "RS0003.schema.json"
+        )
+    )
+    lineage = ("performance", "performance_map", "grid_variables")
+    alternatives, default = schema.get_grid_variable_orders()[lineage]
+    assert [order for _, order in alternatives] == [
+        ["standard_air_volumetric_flow_rate", "static_pressure_difference"],
+        ["speed_number", "static_pressure_difference"],
+    ]
+    assert default == alternatives[0][1]
+
+    # No schema traversal once the table is built
+    def trace(*args):
+        raise AssertionError("Schema traversed")
+
+    monkeypatch.setattr(schema, "trace_lineage", trace)
+    monkeypatch.setattr(schema, "resolve", trace)
+    rep = schema205.load_json("examples/RS0003/Fan-Continuous.RS0003.a205.json")
+    grid_set = schema.create_grid_set(rep, list(lineage))
+    assert list(grid_set) == list(rep["performance"]["performance_map"]["grid_variables"])
+    order = schema.get_grid_variable_order(list(lineage), ["static_pressure_difference", "speed_number"])
+    assert order == ["speed_number", "static_pressure_difference"]
+
+
 def test_process_grid_set():
     rep = schema205.load_json("examples/RS0004/DX-Constant-Efficiency.RS0004.a205.json")
     grid_vars = rep["performance"]["performance_map_cooling"]["grid_variables"]
@@ -204,6 +241,28 @@ def test_process_grid_set():
     assert grid_vars == grid_vars2
 
 
+def test_grid_set():
+    grid_set = schema205.util.create_grid_set(
+        {"b": [10, 20, 30], "a": [1, 2], "c": [0.1, 0.2]}, ["a", "b", "c"]
+    )
+    assert list(grid_set) == ["a", "b", "c"]
+    assert grid_set.shape == (2, 3, 2)
+    assert grid_set.strides == (6, 2, 1)
+    points = list(itertools.product([1, 2], [10, 20, 30], [0.1, 0.2]))
+    assert [grid_set.point(i) for i in range(grid_set.size)] == points
+    assert grid_set.point(grid_set.index((1, 2, 0))) == (2, 30, 0.1)
+    for i, var in enumerate(grid_set):
+        values = [point[i] for point in points]
+        assert list(grid_set[var]) == values
+        assert [grid_set[var][j] for j in range(-grid_set.size, grid_set.size)] == values * 2
+        assert grid_set[var][1:7:2] == values[1:7:2]
+        assert (numpy.asarray(grid_set[var]) == values).all()
+        assert (grid_set.mesh()[var].reshape(-1) == values).all()
+    with pytest.raises(IndexError):
+        grid_set.point(grid_set.size)
+    assert schema205.util.process_grid_set(grid_set) == {"a": [1, 2], "b": [10, 20, 30], "c": [0.1, 0.2]}
+
+
 def test_get_schema_rs_title():
     schema = schema205.A205Schema(
         os.path.join(
@@ -213,3 +272,346 @@ def test_get_schema_rs_title():
 
     title = schema.get_rs_title("RS0001")
     assert title == "Chiller"
+
+
+def test_schema_registry():
+    schema_dir = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+    registry = schema205.SchemaRegistry(schema_dir, max_size=2)
+    rep = schema205.load_json("examples/RS0004/DX-Constant-Efficiency.RS0004.a205.json")
+
+    # Compiled schemas are reused between calls
+    schema = registry.get_for_instance(rep)
+    assert registry.get("RS0004", rep["metadata"]["schema_version"]) is schema
+    registry.validate(rep)
+
+    # Least-recently-used schema is evicted first
+    registry.get("RS0001")
+    registry.get("RS0004")
+    registry.get("RS0003")
+    assert ("RS0001", "3.0.0") not in registry
+    assert registry.get("RS0004") is schema
+    assert len(registry) == 2
+
+
+def test_schema_registry_versions(tmp_path):
+    schema_dir = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+    # Register a second version of the schema set side by side with the first
+    for file_name in os.listdir(schema_dir):
+        content = schema205.load_json(os.path.join(schema_dir, file_name))
+        if "version" in content:
+            content["version"] = "99.0.0"
+        schema205.dump(content, str(tmp_path / file_name))
+    registry = schema205.SchemaRegistry([schema_dir, str(tmp_path)])
+    assert registry.versions("RS0004") == ["2.0.0", "99.0.0"]
+    assert registry.get("RS0004", "2.0.0") is not registry.get("RS0004", "99.0.0")
+
+    # Unregistered versions fall back to the latest version unless strict
+    assert registry.get("RS0004", "1.0.0") is registry.get("RS0004", "99.0.0")
+    registry.strict_version = True
+    with pytest.raises(Exception, match="not registered"):
+        registry.get("RS0004", "1.0.0")
+
+
+def test_homogeneous_array_fast_path():
+    schema = schema205.A205Schema(
+        os.path.join(
+            os.path.dirname(__file__), "..", "build", "schema", "RS0004.schema.json"
+        )
+    )
+    reference = jsonschema.Draft7Validator(
+        schema.validator.schema, resolver=schema.validator.resolver
+    )
+    rep = schema205.load_json("examples/RS0004/HPDM.RS0004.a205.json")
+    lookup_variables = rep["performance"]["performance_map_cooling"]["lookup_variables"]
+    lookup_variables["gross_power"][3] = True
+    lookup_variables["gross_total_capacity"][7] = "1.0"
+    lookup_variables["operation_state"][11] = "BROKEN"
+    grid_variables = rep["performance"]["performance_map_cooling"]["grid_variables"]
+    grid_variables["compressor_sequence_number"] = [1.0, 2.5]
+
+    def messages(validator):
+        return [
+            f"{e.message} ({'.'.join([str(x) for x in e.path])})"
+            for e in sorted(validator.iter_errors(rep), key=lambda e: e.path)
+        ]
+
+    assert len(messages(schema.validator)) == 4
+    assert messages(schema.validator) == messages(reference)
+
+    # Bounds are checked for the whole array
+    items = {"type": "number", "minimum": 0.0, "exclusiveMaximum": 1.0}
+    assert schema205.schema.numeric_array_is_valid(items, [0.0, 0.5, 0.99])
+    assert not schema205.schema.numeric_array_is_valid(items, [0.0, 0.5, 1.0])
+    assert not schema205.schema.numeric_array_is_valid(items, [-1, 0.5])
+    assert not schema205.schema.numeric_array_is_valid({"type": "integer"}, [1, False])
+
+
+def test_bundle_schema(tmp_path):
+    schema_dir = os.path.join(os.path.dirname(__file__), "..", "build", "schema")
+    bundle = schema205.bundle.bundle_schema(os.path.join(schema_dir, "RS0002.schema.json"))
+
+    # Nested representations (RS0002 -> RS0003 -> RS0005) and common definitions are relocated
+    refs = []
+
+    def collect_refs(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                refs.append(node["$ref"])
+            for value in node.values():
+                collect_refs(value)
+        elif isinstance(node, list):
+            for value in node:
+                collect_refs(value)
+
+    collect_refs(bundle)
+    assert all(ref.startswith("#/") for ref in refs)
+    for file_name in ["ASHRAE205.schema.json", "RS0003.schema.json", "RS0005.schema.json"]:
+        assert file_name in bundle["definitions"]
+
+    # Bundled artifacts validate without access to any other schema file
+    schema205.bundle.bundle_dir(schema_dir, str(tmp_path))
+    bundle_path = str(tmp_path / "RS0002.schema.json")
+    assert schema205.load_json(bundle_path) == bundle
+    assert schema205.bundle.bundle_schema(bundle_path) == bundle
+    schema = schema205.A205Schema(os.path.join("no-such-dir", "RS0002.schema.json"), bundle)
+    rep = schema205.load_json("examples/RS0002/Unitary-Constant-Efficiency.RS0002.a205.json")
+    schema.validate(rep)
+    assert schema.get_rs_title("RS0003") == "Fan Assembly"
+    node = schema.resolve_ref("RS0003.schema.json#/definitions/RS0003")
+    assert node == bundle["definitions"]["RS0003.schema.json"]["definitions"]["RS0003"]
+
+
+def test_lineage_index():
+    schema = schema205.A205Schema(
+        os.path.join(
+            os.path.dirname(__file__), "..", "build", "schema", "RS0003.schema.json"
+        )
+    )
+    index = schema.get_lineage_index()
+    for key in [
+        ((), ()),
+        (("description", "product_information", "impeller_type"), (None, None, None)),
+        (("performance", "performance_map", "grid_variables"), (None, 1, None)),
+        (("performance", "performance_map", "grid_variables"), (None, 2, None)),
+    ]:
+        assert key in index
+
+    lineages = list(schema.iter_lineages())
+    assert len(lineages) == len(index)
+    assert [len(lineage) for lineage, _, _ in lineages] == sorted(len(lineage) for lineage, _, _ in lineages)
+    for lineage, options, node in lineages:
+        assert node == schema.trace_schema_node(list(lineage), list(options))
+        assert schema.get_schema_node(list(lineage), list(options)) is node
+
+    # Lineages missing from the index are still traced
+    with pytest.raises(KeyError):
+        schema.get_schema_node(["performance", "no_such_element"])
+
+
+def test_resolution_is_side_effect_free():
+    schema = schema205.A205Schema(
+        os.path.join(
+            os.path.dirname(__file__), "..", "build", "schema", "RS0002.schema.json"
+        )
+    )
+    original = copy.deepcopy(schema.get_schema())
+    resolver = schema.validator._ref_resolver
+    scopes = list(resolver._scopes_stack)
+    lineages = [(list(lineage), list(options)) for lineage, options, _ in schema.iter_lineages()]
+
+    def soak():
+        for lineage, options in lineages:
+            schema.get_schema_node(lineage, options)
+            schema.trace_schema_node(lineage, options)
+
+    soak()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(20):
+        soak()
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    assert growth < 10000
+    assert resolver._scopes_stack == scopes
+    assert schema.get_schema() == original
+    node = schema.get_schema_node(["performance", "indoor_fan_representation"])
+    with pytest.raises(TypeError):
+        node["description"] = "Modified"
+
+
+def test_compact_representation():
+    schema = schema205.A205Schema(
+        os.path.join(os.path.dirname(__file__), "..", "build", "schema", "RS0004.schema.json")
+    )
+    example = os.path.join(os.path.dirname(__file__), "..", "examples", "RS0004", "HPDM.RS0004.a205.json")
+    schema.get_array_typecodes()
+
+    def measure(load):
+        tracemalloc.start()
+        representation = load(example)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return representation, size
+
+    plain, plain_size = measure(schema205.load_json)
+    compact, compact_size = measure(schema.load_compact)
+    assert compact_size < plain_size / 4
+
+    lineage = ["performance", "performance_map_cooling"]
+    lookup_variables = compact["performance"]["performance_map_cooling"]["lookup_variables"]
+    grid_variables = compact["performance"]["performance_map_cooling"]["grid_variables"]
+    assert lookup_variables["gross_power"].typecode == "d"
+    assert grid_variables["compressor_sequence_number"].typecode == "q"
+    assert list(lookup_variables["gross_power"]) == plain["performance"]["performance_map_cooling"]["lookup_variables"]["gross_power"]
+    assert isinstance(lookup_variables["operation_state"], tuple)
+    with pytest.raises(TypeError):
+        compact["metadata"]["description"] = "Modified"
+
+    assert schema.is_valid(compact)
+    plain_map = PerformanceMap(schema, plain, lineage)
+    compact_map = PerformanceMap(schema, compact, lineage)
+    assert compact_map.lookup_variable_names == plain_map.lookup_variable_names
+    assert numpy.array_equal(compact_map.interpolator.table, plain_map.interpolator.table)
+
+
+def test_cbor():
+    from schema205.file_io import cbor_dumps, cbor_loads
+
+    # Examples from RFC 8949, Appendix A
+    assert cbor_dumps(0) == bytes.fromhex("00")
+    assert cbor_dumps(100) == bytes.fromhex("1864")
+    assert cbor_dumps(-1000) == bytes.fromhex("3903e7")
+    assert cbor_dumps(18446744073709551615) == bytes.fromhex("1bffffffffffffffff")
+    assert cbor_dumps(1.1) == bytes.fromhex("fb3ff199999999999a")
+    assert cbor_dumps([1, [2, 3], [4, 5]]) == bytes.fromhex("8301820203820405")
+    assert cbor_dumps({"a": 1, "b": [2, 3]}) == bytes.fromhex("a26161016162820203")
+    assert cbor_dumps("ü") == bytes.fromhex("62c3bc")
+    assert cbor_loads(bytes.fromhex("f93c00")) == 1.0
+    assert cbor_loads(bytes.fromhex("fa47c35000")) == 100000.0
+    assert cbor_loads(bytes.fromhex("9f018202039f0405ffff")) == [1, [2, 3], [4, 5]]
+    assert cbor_loads(bytes.fromhex("bf61610161629f0203ffff")) == {"a": 1, "b": [2, 3]}
+    assert cbor_loads(bytes.fromhex("7f657374726561646d696e67ff")) == "streaming"
+    assert cbor_loads(bytes.fromhex("83f4f5f6")) == [False, True, None]
+    # Packed float arrays, including RFC 8746 typed arrays
+    assert cbor_dumps([0.5, 1.5]) == bytes.fromhex("82fb3fe0000000000000fb3ff8000000000000")
+    assert cbor_loads(bytes.fromhex("83fa3f800000fa40000000fa40400000")) == [1.0, 2.0, 3.0]
+    assert cbor_loads(bytes.fromhex("d85650000000000000f03f0000000000000040")) == [1.0, 2.0]
+    # Integers among floats are encoded as floats; other integers are kept
+    assert [type(value) for value in cbor_loads(cbor_dumps([0.5, 1, 1.5]))] == [float] * 3
+    assert cbor_loads(cbor_dumps([1, 2**60, "a"])) == [1, 2**60, "a"]
+
+    with pytest.raises(Exception):
+        cbor_loads(bytes.fromhex("82fb3fe0000000000000"))  # Truncated
+    with pytest.raises(Exception):
+        cbor_loads(bytes.fromhex("0000"))  # Trailing data
+    with pytest.raises(Exception):
+        cbor_loads(bytes.fromhex("c11a514b67b0"))  # Unsupported tag
+    with pytest.raises(Exception):
+        cbor_dumps(object())
+
+
+def test_cbor_file(tmp_path):
+    example = os.path.join(os.path.dirname(__file__), "..", "examples", "RS0004", "HPDM.RS0004.a205.json")
+    representation = schema205.load_json(example)
+    cbor_path = str(tmp_path / "HPDM.RS0004.a205.cbor")
+    schema205.dump(representation, cbor_path)
+    assert os.path.getsize(cbor_path) < os.path.getsize(example)
+    assert schema205.load(cbor_path) == representation
+
+    # Compact representations encode to the same content
+    schema = schema205.A205Schema(
+        os.path.join(os.path.dirname(__file__), "..", "build", "schema", "RS0004.schema.json")
+    )
+    compact_path = str(tmp_path / "compact.cbor")
+    schema205.dump(schema.compact(representation), compact_path)
+    loaded = schema205.load(compact_path)
+    lookup_variables = representation["performance"]["performance_map_cooling"]["lookup_variables"]
+    assert loaded["performance"]["performance_map_cooling"]["lookup_variables"]["gross_power"] == pytest.approx(
+        lookup_variables["gross_power"]
+    )
+    schema.validate(loaded)
+
+
+def test_load_source(tmp_path, monkeypatch):
+    from schema205 import file_io
+
+    source_path = tmp_path / "Test.schema.yaml"
+    source_path.write_text("Schema:\n  Object Type: Meta\n  References:\n    - ASHRAE205\n")
+    tree = file_io.load_source(source_path)
+    assert file_io.load_source(str(source_path)) is tree
+    assert isinstance(tree, dict) and isinstance(tree["Schema"]["References"], list)
+    with pytest.raises(TypeError):
+        tree["Schema"]["Object Type"] = "Data Group"
+    with pytest.raises(TypeError):
+        tree["Schema"]["References"].append("RS0001")
+
+    # Copies are mutable; pickles stay read-only
+    references = tree["Schema"]["References"].copy()
+    references.insert(0, "Test")
+    modified = copy.deepcopy(tree)
+    modified["Schema"]["References"].append("RS0001")
+    assert tree["Schema"]["References"] == ["ASHRAE205"]
+    with pytest.raises(TypeError):
+        pickle.loads(pickle.dumps(tree))["Schema"]["References"].append("RS0001")
+
+    # Modified files are parsed again
+    source_path.write_text("Schema:\n  Object Type: Meta\n")
+    os.utime(source_path, ns=(0, 0))
+    assert "References" not in file_io.load_source(source_path)["Schema"]
+
+    # A full translation parses each source file once
+    loads = []
+    original_load = file_io.load_cached_yaml
+    monkeypatch.setattr(file_io, "load_cached_yaml", lambda path: loads.append(path) or original_load(path))
+    file_io.clear_source_cache()
+    source_dir = os.path.join(os.path.dirname(__file__), "..", "schema-source")
+    schema205.json_translate.translate_dir(source_dir, str(tmp_path))
+    schema205.markdown.write_dir(source_dir, str(tmp_path))
+    assert len(loads) == len(set(loads)) == len([name for name in os.listdir(source_dir) if name.endswith(".schema.yaml")])
+
+
+def test_yaml_source_cache(tmp_path, monkeypatch):
+    from schema205 import file_io
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(file_io, "SOURCE_CACHE_DIR", str(cache_dir))
+    source_path = tmp_path / "Test.schema.yaml"
+    source_path.write_text("Schema:\n  Object Type: Meta\n  Version: 1.0.0\n")
+    file_io.clear_source_cache()
+    content = file_io.load_source(str(source_path))
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Other YAML files (e.g., representations) are not cached
+    file_io.load(str(source_path))
+    schema205.json_translate.load(str(source_path))
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Cached content is used without parsing in a new process (simulated by clearing the in-process cache)
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed")
+
+    monkeypatch.setattr(file_io.yaml, "load", fail)
+    file_io.clear_source_cache()
+    assert file_io.load_source(str(source_path)) == content
+
+    # Changed content is parsed again, replacing the file's entry
+    monkeypatch.undo()
+    monkeypatch.setattr(file_io, "SOURCE_CACHE_DIR", str(cache_dir))
+    source_path.write_text("Schema:\n  Object Type: Meta\n  Version: 2.0.0\n")
+    file_io.clear_source_cache()
+    assert file_io.load_source(str(source_path))["Schema"]["Version"] == "2.0.0"
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Corrupt entries are ignored
+    for entry in os.listdir(cache_dir):
+        (cache_dir / entry).write_bytes(b"not a pickle")
+    file_io.clear_source_cache()
+    assert file_io.load_source(str(source_path))["Schema"]["Version"] == "2.0.0"
+
+    # Entries in a directory that other users can write to are never read
+    if hasattr(os, "getuid"):
+        os.chmod(cache_dir, 0o777)
+        monkeypatch.setattr(file_io.pickle, "load", fail)
+        file_io.clear_source_cache()
+        assert file_io.load_source(str(source_path))["Schema"]["Version"] == "2.0.0"
@@ -1,6 +1,7 @@
 import schema205
 import os
 import pytest
+import shutil
 
 EXAMPLES_DIR = 'examples'
 SCHEMA_DIR = os.path.join('build','schema')
@@ -28,6 +29,12 @@ def test_validate(example):
     schema_path = os.path.join(SCHEMA_DIR,f"{schema_name}.schema.json")
     schema205.schema.validate(example, schema_path)
 
+@pytest.mark.parametrize("example",paths, ids=names)
+def test_validate_stream(example):
+    schema_name = schema205.load_json(example)["metadata"]["schema"]
+    schema_path = os.path.join(SCHEMA_DIR,f"{schema_name}.schema.json")
+    schema205.schema.validate(example, schema_path, streaming=True)
+
 BAD_EXAMPLE_DIR = 'test/bad-examples'
 bad_examples = sorted(os.listdir(BAD_EXAMPLE_DIR))
 @pytest.mark.parametrize("example",bad_examples, ids=bad_examples)
@@ -35,3 +42,86 @@ def test_invalidate(example):
     with pytest.raises(Exception):
         schema_path = os.path.join(SCHEMA_DIR,"RS0001.schema.json")
         schema205.schema.validate(os.path.join(BAD_EXAMPLE_DIR,example),schema_path)
+
+@pytest.mark.parametrize("example",bad_examples, ids=bad_examples)
+def test_invalidate_stream(example):
+    with pytest.raises(Exception):
+        schema_path = os.path.join(SCHEMA_DIR,"RS0001.schema.json")
+        schema205.schema.validate(os.path.join(BAD_EXAMPLE_DIR,example),schema_path, streaming=True)
+
+@pytest.mark.parametrize("example",bad_examples, ids=bad_examples)
+def test_invalidate_fail_fast(example):
+    with pytest.raises(Exception):
+        schema_path = os.path.join(SCHEMA_DIR,"RS0001.schema.json")
+        schema205.schema.validate(os.path.join(BAD_EXAMPLE_DIR,example),schema_path, max_errors=1)
+
+def test_error_budget():
+    example = os.path.join(EXAMPLES_DIR,"RS0004","HPDM.RS0004.a205.json")
+    instance = schema205.load_json(example)
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR,"RS0004.schema.json"))
+    assert schema.is_valid(instance)
+    lookup_variables = instance["performance"]["performance_map_cooling"]["lookup_variables"]
+    lookup_variables["gross_power"][:] = ["x"]*len(lookup_variables["gross_power"])
+    assert not schema.is_valid(instance)
+
+    with pytest.raises(Exception) as e:
+        schema.validate(instance, max_errors=3)
+    message = str(e.value)
+    assert "with at least 3 errors" in message
+    assert "4. " not in message
+
+    with pytest.raises(Exception) as e:
+        schema.validate(instance)
+    assert f"with {len(lookup_variables['gross_power'])} errors" in str(e.value)
+
+def test_invalidate_stream_messages(tmp_path):
+    example = os.path.join(EXAMPLES_DIR,"RS0004","HPDM.RS0004.a205.json")
+    instance = schema205.load_json(example)
+    instance["description"]["product_information"]["compressor_type"] = 3
+    instance["performance"]["compressor_speed_control_type"] = "BAD"
+    performance_map = instance["performance"]["performance_map_cooling"]
+    performance_map["grid_variables"]["compressor_sequence_number"][0] = 1.5
+    performance_map["lookup_variables"]["gross_power"][5] = "x"
+    del instance["performance"]["performance_map_standby"]["lookup_variables"]
+    bad_example = str(tmp_path / "bad.a205.json")
+    schema205.dump(instance, bad_example)
+
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR,"RS0004.schema.json"))
+    with pytest.raises(Exception) as expected:
+        schema.validate(instance)
+    with pytest.raises(Exception) as streamed:
+        schema.validate_stream(bad_example, chunk_size=1024)
+    assert "with 6 errors" in str(expected.value)
+    assert str(streamed.value) == str(expected.value)
+    with pytest.raises(Exception) as compact:
+        schema.validate(schema.compact(instance))
+    assert str(compact.value) == str(expected.value)
+
+@pytest.mark.parametrize("example",paths, ids=names)
+def test_validate_compact(example):
+    registry = schema205.SchemaRegistry(SCHEMA_DIR)
+    registry.validate(registry.load_compact(example))
+
+@pytest.mark.parametrize("example",bad_examples, ids=bad_examples)
+def test_invalidate_compact(example):
+    schema = schema205.A205Schema(os.path.join(SCHEMA_DIR,"RS0001.schema.json"))
+    with pytest.raises(Exception):
+        schema.validate(schema.load_compact(os.path.join(BAD_EXAMPLE_DIR,example)))
+
+def test_validate_directory(tmp_path, capsys):
+    for example in paths[:4] + [paths[-1]]:
+        shutil.copy(example, tmp_path)
+    schema205.schema.validate_directory(str(tmp_path), SCHEMA_DIR, jobs=2)
+    assert capsys.readouterr().out.count("Validation successful") == 5
+
+@pytest.mark.parametrize("jobs",[1, 3])
+def test_invalidate_directory(tmp_path, jobs):
+    shutil.copy(paths[0], tmp_path / "a.a205.json")
+    shutil.copy(os.path.join(BAD_EXAMPLE_DIR,"invalid-RS_instance.json"), tmp_path / "b.a205.json")
+    shutil.copy(paths[1], tmp_path / "c.a205.json")
+    shutil.copy(os.path.join(BAD_EXAMPLE_DIR,"empty.json"), tmp_path / "d.a205.json")
+    with pytest.raises(Exception) as e:
+        schema205.schema.validate_directory(str(tmp_path), SCHEMA_DIR, jobs=jobs)
+    errors = str(e.value).split("\n\n")
+    assert len(errors) == 2
+    assert errors[0].startswith("Validation failed")